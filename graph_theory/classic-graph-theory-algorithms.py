@@ -170,6 +170,158 @@ for finding shortest path in a DAG.
 
 
 
+# PYTHON IMPLEMENTATION OF TOPOLOGICAL SORT WITHOUT RECURSION
+
+# The recursive dfs() above has two problems in Python. It runs out of stack on any graph with
+# a path longer than the recursion limit, and on a graph with a cycle it silently returns an
+# ordering which is not a topological ordering at all. Both strategies below are iterative and
+# raise a ValueError naming one offending cycle instead (the cycle is also kept in 'cycle').
+
+# KAHN'S ALGORITHM: Repeatedly remove a node with no incoming edges (in-degree 0) from the
+# graph, decrementing the in-degree of its neighbours. If nodes remain when no node with
+# in-degree 0 is left, the remaining nodes contain a cycle.
+# Removing all the nodes with in-degree 0 at the same time instead of one by one splits the
+# ordering into LEVELS: level 0 holds the nodes without dependencies, level 1 the nodes which
+# only depend on level 0, and so on. The nodes of one level don't depend on each other, so
+# they can be dispatched concurrently (eg: independent build tasks), and every level is as
+# large as possible. The ordering is stored flat as one typed array with the levels one after
+# the other, plus an array of offsets where each level starts, so a graph with 500k nodes
+# doesn't need 500k small Python lists.
+
+# DFS: The same idea as the pseudocode above with an explicit call stack and an 'edge_index'
+# array (see Tarjan's algorithm below). Every node is coloured WHITE (unvisited), GREY (its
+# dfs() call is in progress) or BLACK (done). An edge to a GREY node points back into the call
+# stack, and the call stack from that node onwards is a cycle.
+
+from array import array
+
+
+class TopologicalSorter:
+    WHITE, GREY, BLACK = 0, 1, 2
+
+    # 'graph' is an adjacency list: graph[i] holds the nodes which depend on node 'i'
+    # (ie: the edges i -> graph[i][0], i -> graph[i][1], ...)
+    def __init__(self, graph):
+        if graph is None:
+            raise ValueError('Graph cannot be None.')
+        self.n = len(graph)
+        self.graph = graph
+        self.cycle = None
+        self.order = None
+        self.level_offsets = None
+
+    # Returns a topological ordering of the nodes, using Kahn's algorithm ('kahn') or DFS ('dfs')
+    def sort(self, strategy='kahn'):
+        if strategy == 'kahn':
+            self._kahn()
+            return self.order
+        if strategy == 'dfs':
+            return self._dfs()
+        raise ValueError('Unknown strategy: ' + str(strategy))
+
+    # Returns the levels of the ordering as a list of lists of nodes
+    def levels(self):
+        self._kahn()
+        order, offsets = self.order, self.level_offsets
+        return [order[offsets[i]:offsets[i + 1]].tolist() for i in range(len(offsets) - 1)]
+
+    # Returns the level of every node (the length of the longest chain of dependencies into it)
+    def level_of(self):
+        self._kahn()
+        order, offsets = self.order, self.level_offsets
+        level = array('i', [0]) * self.n
+        for i in range(len(offsets) - 1):
+            for node in order[offsets[i]:offsets[i + 1]]:
+                level[node] = i
+        return level
+
+    # Returns one cycle of the graph as a list of nodes [a, b, ..., a], or None for a DAG
+    def find_cycle(self):
+        try:
+            self._dfs()
+        except ValueError:
+            pass
+        return self.cycle
+
+    def _raise_cycle(self, cycle):
+        self.cycle = cycle
+        raise ValueError('Graph contains a cycle: ' + ' -> '.join(map(str, cycle)))
+
+    def _kahn(self):
+        if self.order is not None:
+            return
+        n, graph = self.n, self.graph
+        in_degree = array('i', [0]) * n
+        for neighbours in graph:
+            for to in neighbours:
+                in_degree[to] += 1
+
+        order = array('i', [i for i in range(n) if in_degree[i] == 0])
+        offsets = array('q', [0])
+        start = 0
+        # the nodes of the current level are order[start:end], and their neighbours which
+        # drop to in-degree 0 are appended as the next level
+        while start < len(order):
+            end = len(order)
+            offsets.append(end)
+            for i in range(start, end):
+                for to in graph[order[i]]:
+                    in_degree[to] -= 1
+                    if in_degree[to] == 0:
+                        order.append(to)
+            start = end
+
+        if len(order) < n:
+            # only nodes on or behind a cycle are left: let the DFS point at a cycle
+            self._dfs()
+        self.order, self.level_offsets = order, offsets
+
+    def _dfs(self):
+        n, graph = self.n, self.graph
+        WHITE, GREY, BLACK = self.WHITE, self.GREY, self.BLACK
+        colour = bytearray(n)
+        edge_index = array('i', [0]) * n
+        ordering = array('i', [0]) * n
+        i = n - 1
+        call_stack = []
+        for start in range(n):
+            if colour[start] != WHITE:
+                continue
+            colour[start] = GREY
+            call_stack.append(start)
+            while call_stack:
+                at = call_stack[-1]
+                neighbours = graph[at]
+                j = edge_index[at]
+                if j < len(neighbours):
+                    edge_index[at] = j + 1
+                    to = neighbours[j]
+                    if colour[to] == WHITE:
+                        colour[to] = GREY
+                        call_stack.append(to)
+                    elif colour[to] == GREY:
+                        cycle = call_stack[call_stack.index(to):]
+                        cycle.append(to)
+                        self._raise_cycle(cycle)
+                    continue
+                call_stack.pop()
+                colour[at] = BLACK
+                ordering[i] = at
+                i -= 1
+        return ordering
+
+
+# Example: a build where 0 and 1 have no dependencies, 2 needs 0 and 1, 3 needs 0, and 4 needs 2 and 3
+topsort = TopologicalSorter([[2, 3], [2], [4], [4], []])
+print(list(topsort.sort())) # [0, 1, 3, 2, 4]
+print(list(topsort.sort('dfs'))) # [1, 0, 3, 2, 4]
+print(topsort.levels()) # [[0, 1], [3, 2], [4]]
+print(TopologicalSorter([[1], [2], [3], [1]]).find_cycle()) # [1, 2, 3, 1]
+
+
+
+
+
 # FINDING SHORTEST AND LONGEST PATH IN DIRECTED ACYCLIC GRAPHS
 
 # Recall that Directed Acyclic Graph (DAG) is a graph with DIRECTED EDGES and NO CYCLES.
@@ -256,6 +408,160 @@ public static integer[] dagShortestPath(Map<Integer, List<Edge>> graph, int star
 
 
 
+# PYTHON IMPLEMENTATION OF SHORTEST AND LONGEST PATHS ON A DAG WITH A CACHED TOPOLOGICAL ORDER
+
+# The topological order only depends on the edges of the graph and not on the source node, so
+# it is computed once with the TopologicalSorter above and reused by every query until an edge
+# is added. A single source query then only walks the ordering from the position of the source
+# node onwards, since no node before it in the ordering can be reached from it.
+
+# MULTI-SOURCE: When the distances from many sources are needed (eg: running a critical path
+# analysis from every stage of a pipeline), all_sources() relaxes the edges for a whole batch
+# of sources at once on a (sources x nodes) NumPy matrix. The relaxation is done level by level
+# using the levels of the topological sort: all the edges out of one level can be relaxed
+# together, since the distances to the nodes of a level are final once every level before it is
+# done. The edges out of a level are sorted by their destination, so that the minimum over all
+# the edges into the same node is a single np.minimum.reduceat() call (as in the Bellman-Ford
+# solver below). This costs a handful of NumPy calls per level instead of a Python loop over
+# every edge for every source.
+
+import numpy as np
+
+
+class DagShortestPathSolver:
+    # n - number of nodes in the graph. Use add_edge() to add the directed edges.
+    def __init__(self, n):
+        self.n = n
+        # adjacency list where each edge is stored as a (to, weight) tuple
+        self.graph = [[] for _ in range(n)]
+        self.order = None
+        self.levels = None
+        self.prev = None
+
+    def add_edge(self, frm, to, weight):
+        self.graph[frm].append((to, weight))
+        # the cached ordering is stale
+        self.order = None
+        self.levels = None
+
+    # Returns the cached topological ordering of the nodes (raises ValueError on a cycle)
+    def topological_order(self):
+        if self.order is None:
+            self.sorter = TopologicalSorter([[to for to, _ in edges] for edges in self.graph])
+            self.order = self.sorter.sort()
+            self.position = array('i', [0]) * self.n
+            for i, node in enumerate(self.order):
+                self.position[node] = i
+        return self.order
+
+    # Returns the shortest distance from 'start' to every node (positive infinity if unreachable).
+    # The 'prev' array is kept on the solver for path reconstruction.
+    def shortest_path(self, start):
+        return self._single_source(start, 1)
+
+    # Returns the longest distance from 'start' to every node (negative infinity if unreachable)
+    def longest_path(self, start):
+        return self._single_source(start, -1)
+
+    # Reconstructs the shortest (or longest) path of nodes from 'start' to 'end' inclusive. An
+    # empty list is returned if 'end' is unreachable from 'start'.
+    def reconstruct_path(self, start, end, longest=False):
+        if start < 0 or start >= self.n or end < 0 or end >= self.n:
+            raise IndexError('Invalid node index')
+        dist = self._single_source(start, -1 if longest else 1)
+        path = []
+        if abs(dist[end]) == float('inf'):
+            return path
+        at = end
+        while at != -1:
+            path.append(at)
+            at = self.prev[at]
+        path.reverse()
+        return path
+
+    # Returns a (len(sources) x n) matrix of the distances from every source in 'sources'
+    # (all the nodes by default) to every node. 'batch_size' bounds how many sources are relaxed
+    # together, which bounds the size of the temporary arrays.
+    def all_sources(self, sources=None, longest=False, batch_size=256):
+        self._prepare_levels()
+        sources = np.arange(self.n) if sources is None else np.asarray(sources, dtype=np.int64)
+        sign = -1 if longest else 1
+        result = np.empty((len(sources), self.n))
+        for b in range(0, len(sources), batch_size):
+            batch = sources[b:b + batch_size]
+            dist = np.full((len(batch), self.n), np.inf)
+            dist[np.arange(len(batch)), batch] = 0
+            for src, weight, group_starts, targets in self.levels:
+                candidates = dist[:, src] + sign * weight
+                best = np.minimum.reduceat(candidates, group_starts, axis=1)
+                dist[:, targets] = np.minimum(dist[:, targets], best)
+            result[b:b + batch_size] = dist
+        if longest:
+            result = -result
+        return result
+
+    def _single_source(self, start, sign):
+        order = self.topological_order()
+        graph = self.graph
+        inf = float('inf')
+        dist = [inf] * self.n
+        prev = array('i', [-1]) * self.n
+        dist[start] = 0
+        for i in range(self.position[start], self.n):
+            at = order[i]
+            d = dist[at]
+            # skip the nodes which are not reachable from 'start'
+            if d == inf:
+                continue
+            for to, weight in graph[at]:
+                new_dist = d + sign * weight
+                if new_dist < dist[to]:
+                    dist[to] = new_dist
+                    prev[to] = at
+        self.prev = prev
+        if sign < 0:
+            dist = [-d for d in dist]
+        return dist
+
+    # Groups the edges by the level of their source node, then by their destination node
+    def _prepare_levels(self):
+        if self.levels is not None:
+            return
+        self.topological_order()
+        level = np.frombuffer(self.sorter.level_of(), dtype=np.int32)
+        src = np.array([i for i, edges in enumerate(self.graph) for _ in edges], dtype=np.int64)
+        dst = np.array([to for edges in self.graph for to, _ in edges], dtype=np.int64)
+        weight = np.array([w for edges in self.graph for _, w in edges], dtype=np.float64)
+        src_level = level[src]
+        perm = np.lexsort((dst, src_level))
+        src, dst, weight, src_level = src[perm], dst[perm], weight[perm], src_level[perm]
+        level_starts = np.flatnonzero(np.diff(src_level, prepend=-1))
+        level_ends = np.append(level_starts[1:], len(src))
+        levels = []
+        for a, b in zip(level_starts, level_ends):
+            new_group = np.ones(b - a, dtype=bool)
+            new_group[1:] = dst[a + 1:b] != dst[a:b - 1]
+            group_starts = np.flatnonzero(new_group)
+            levels.append((src[a:b], weight[a:b], group_starts, dst[a:b][group_starts]))
+        self.levels = levels
+
+
+# The example DAG from above (A = 0, B = 1, C = 2, D = 3, E = 4, F = 5, G = 6, H = 7)
+solver = DagShortestPathSolver(8)
+for frm, to, weight in [(0, 1, 3), (0, 2, 6), (1, 2, 4), (1, 3, 4), (1, 4, 11), (2, 3, 8), (2, 6, 11),
+                        (3, 4, -4), (3, 5, 5), (3, 6, 2), (4, 7, 9), (5, 7, 1), (6, 7, 2)]:
+    solver.add_edge(frm, to, weight)
+# G is reached through D for 3+4+2 = 9, not 11+6 as in the table above
+print(solver.shortest_path(0)) # [0, 3, 6, 7, 3, 12, 9, 11]
+print(solver.longest_path(0)) # [0, 3, 7, 15, 14, 20, 18, 23]
+print(solver.reconstruct_path(0, 7, longest=True)) # [0, 1, 4, 7]
+print(solver.all_sources([0, 3])[1]) # [inf inf inf  0. -4.  5.  2.  4.]
+
+
+
+
+
+
 # DIJKSTRA'S SHORTEST PATH ALGORITHM
 
 # This is an important algorithm used to find single source shortest path (SSSP) in graphs with
@@ -652,6 +958,493 @@ public class DijkstrasShortestPathAdjacencyWithDHeap {
 
 
 
+# PYTHON IMPLEMENTATION OF EAGER DIJKSTRA'S ALGORITHM
+
+# A runnable port of the eager solver above. The indexed priority queue is a min indexed D-ary
+# heap (see 'indexed-priority-queue.py' for the full walkthrough of the 'pm', 'im' and 'vals'
+# arrays). Only the operations needed by Dijkstra's algorithm are kept here so that this file can
+# be run on its own. Since every node has at most one key-value pair in the IPQ, the heap never
+# holds more than 'n' entries, unlike the lazy version which can hold up to 'E' stale pairs.
+# Unless a degree is passed to dijkstra(), the heap degree is picked as D = E/V following the
+# D-ARY HEAP OPTIMIZATION section above.
+
+
+class MinIndexedDHeap:
+    def __init__(self, degree, max_size):
+        self.d = max(2, degree)
+        self.sz = 0
+        self.pm = array('i', [-1]) * max_size # key index -> heap position
+        self.im = array('i', [-1]) * max_size # heap position -> key index
+        self.vals = [None] * max_size # key index -> value
+
+    def is_empty(self):
+        return self.sz == 0
+
+    def contains(self, ki):
+        return self.pm[ki] != -1
+
+    def peek_min_value(self):
+        return self.vals[self.im[0]]
+
+    def insert(self, ki, value):
+        self.pm[ki] = self.sz
+        self.im[self.sz] = ki
+        self.vals[ki] = value
+        self._swim(self.sz)
+        self.sz += 1
+
+    # remove the root node and return its (key index, value) pair
+    def poll_min(self):
+        pm, im = self.pm, self.im
+        ki = im[0]
+        self.sz -= 1
+        self._swap(0, self.sz)
+        self._sink(0)
+        pm[ki] = -1
+        im[self.sz] = -1
+        value = self.vals[ki]
+        self.vals[ki] = None
+        return ki, value
+
+    def decrease_key(self, ki, value):
+        if value < self.vals[ki]:
+            self.vals[ki] = value
+            self._swim(self.pm[ki])
+
+    # empty the heap in O(len(keys)) instead of O(max_size), where 'keys' holds (at least) every
+    # key index which was inserted since the heap was created or last reset
+    def reset(self, keys):
+        for ki in keys:
+            self.pm[ki] = -1
+            self.vals[ki] = None
+        self.sz = 0
+
+    def _sink(self, i):
+        d, vals, im = self.d, self.vals, self.im
+        while True:
+            # find the smallest of the (up to) 'd' children of node 'i'
+            start = i * d + 1
+            end = min(self.sz, start + d)
+            if start >= end:
+                return
+            smallest = start
+            smallest_value = vals[im[start]]
+            for j in range(start + 1, end):
+                if vals[im[j]] < smallest_value:
+                    smallest = j
+                    smallest_value = vals[im[j]]
+            if vals[im[i]] <= smallest_value:
+                return
+            self._swap(smallest, i)
+            i = smallest
+
+    def _swim(self, i):
+        d, vals, im = self.d, self.vals, self.im
+        while i > 0:
+            p = (i - 1) // d
+            if vals[im[p]] <= vals[im[i]]:
+                return
+            self._swap(i, p)
+            i = p
+
+    def _swap(self, i, j):
+        pm, im = self.pm, self.im
+        pm[im[j]] = i
+        pm[im[i]] = j
+        im[i], im[j] = im[j], im[i]
+
+
+class DijkstrasShortestPathEager:
+    # n - number of nodes in the graph. Use add_edge() to add the directed edges.
+    def __init__(self, n):
+        self.n = n
+        self.edge_count = 0
+        # adjacency list where each edge is stored as a (to, cost) tuple
+        self.graph = [[] for _ in range(n)]
+        self.dist = None
+        self.prev = None
+
+    def add_edge(self, frm, to, cost):
+        if cost < 0:
+            raise ValueError('Dijkstra\'s algorithm does not support negative edge weights')
+        self.edge_count += 1
+        self.graph[frm].append((to, cost))
+
+    # Runs Dijkstra's algorithm from 'start'. When 'end' is given, the search stops as soon
+    # as the end node is polled from the IPQ and the shortest distance to it is returned
+    # (positive infinity if it is unreachable). Otherwise the whole 'dist' array is returned.
+    # The 'prev' array is kept on the solver for path reconstruction. 'degree' overrides the
+    # degree of the D-ary heap, which is otherwise set to the average degree E/V.
+    def dijkstra(self, start, end=None, degree=None):
+        n, graph = self.n, self.graph
+        inf = float('inf')
+        dist = [inf] * n
+        prev = array('i', [-1]) * n
+        visited = bytearray(n)
+        dist[start] = 0
+        if degree is None:
+            degree = self.edge_count // n
+        ipq = MinIndexedDHeap(degree, n)
+        ipq.insert(start, 0)
+        self.dist, self.prev = dist, prev
+
+        while not ipq.is_empty():
+            node_id, min_value = ipq.poll_min()
+            visited[node_id] = 1
+            # once the end node has been polled its distance can no longer improve, since
+            # all edge weights are non-negative
+            if node_id == end:
+                return dist[end]
+            for to, cost in graph[node_id]:
+                if visited[to]:
+                    continue
+                new_dist = min_value + cost
+                if new_dist < dist[to]:
+                    prev[to] = node_id
+                    dist[to] = new_dist
+                    if not ipq.contains(to):
+                        ipq.insert(to, new_dist)
+                    else:
+                        ipq.decrease_key(to, new_dist)
+        if end is not None:
+            return inf
+        return dist
+
+    # Reconstructs the shortest path of nodes from 'start' to 'end' inclusive. An empty list
+    # is returned if 'end' is unreachable from 'start'.
+    def reconstruct_path(self, start, end):
+        if start < 0 or start >= self.n or end < 0 or end >= self.n:
+            raise IndexError('Invalid node index')
+        path = []
+        if self.dijkstra(start, end) == float('inf'):
+            return path
+        at = end
+        while at != -1:
+            path.append(at)
+            at = self.prev[at]
+        path.reverse()
+        return path
+
+
+solver = DijkstrasShortestPathEager(6)
+solver.add_edge(0, 1, 5)
+solver.add_edge(0, 2, 1)
+solver.add_edge(1, 2, 2)
+solver.add_edge(2, 1, 3)
+solver.add_edge(1, 3, 3)
+solver.add_edge(2, 4, 12)
+solver.add_edge(1, 4, 20)
+solver.add_edge(3, 4, 2)
+solver.add_edge(4, 5, 6)
+print(solver.dijkstra(0)) # [0, 4, 1, 7, 9, 15]
+print(solver.dijkstra(0, 4)) # 9
+print(solver.dijkstra(0, degree=8)) # [0, 4, 1, 7, 9, 15]
+print(solver.reconstruct_path(0, 5)) # [0, 2, 1, 3, 4, 5]
+
+
+
+
+
+
+# BIDIRECTIONAL DIJKSTRA'S ALGORITHM
+
+# For a single start and end node, Dijkstra's algorithm explores every node which is closer to
+# the start node than the end node is: on a road network, a "ball" around the start node which
+# grows with the distance. Bidirectional Dijkstra runs two searches at the same time instead:
+# a forward search from the start node over the edges, and a backward search from the end node
+# over the reversed edges. Two balls with half the radius contain far fewer nodes than one big
+# ball, especially on large sparse graphs.
+# Every step polls the node with the smallest distance among both IPQs. Whenever an edge is
+# relaxed towards a node already seen by the other search, a complete path has been found and
+# the length of the best one seen so far is kept in 'mu' (together with the node where the two
+# halves meet).
+# STOPPING CRITERION: It is NOT correct to stop as soon as a node is polled by both searches,
+# since the best path does not have to go through that node. The searches stop once the sum of
+# the smallest values in both IPQs is at least 'mu': any path which has not been seen yet has
+# to go through a node which is still in both IPQs, and so it cannot be shorter than 'mu'.
+
+
+class BidirectionalDijkstra(DijkstrasShortestPathEager):
+    def __init__(self, n):
+        super().__init__(n)
+        # adjacency list of the reversed edges, used by the backward search
+        self.reverse_graph = [[] for _ in range(n)]
+
+    def add_edge(self, frm, to, cost):
+        super().add_edge(frm, to, cost)
+        self.reverse_graph[to].append((frm, cost))
+
+    # Returns a (distance, path) pair for the shortest path from 'start' to 'end' inclusive.
+    # The distance is positive infinity and the path is empty if 'end' is unreachable.
+    def shortest_path(self, start, end, degree=None):
+        if start < 0 or start >= self.n or end < 0 or end >= self.n:
+            raise IndexError('Invalid node index')
+        n = self.n
+        inf = float('inf')
+        if degree is None:
+            degree = self.edge_count // n
+        graphs = (self.graph, self.reverse_graph)
+        dist = ([inf] * n, [inf] * n)
+        prev = (array('i', [-1]) * n, array('i', [-1]) * n)
+        visited = (bytearray(n), bytearray(n))
+        ipqs = (MinIndexedDHeap(degree, n), MinIndexedDHeap(degree, n))
+        dist[0][start] = dist[1][end] = 0
+        ipqs[0].insert(start, 0)
+        ipqs[1].insert(end, 0)
+        mu, meet = (0, start) if start == end else (inf, -1)
+
+        while not ipqs[0].is_empty() and not ipqs[1].is_empty():
+            forward_min, backward_min = ipqs[0].peek_min_value(), ipqs[1].peek_min_value()
+            if forward_min + backward_min >= mu:
+                break
+            # 0 for the forward search, 1 for the backward search
+            side = 0 if forward_min <= backward_min else 1
+            ipq, this_dist, other_dist = ipqs[side], dist[side], dist[1 - side]
+            node_id, min_value = ipq.poll_min()
+            visited[side][node_id] = 1
+            for to, cost in graphs[side][node_id]:
+                new_dist = min_value + cost
+                # a path start -> node_id -> to -> end through both searches
+                if new_dist + other_dist[to] < mu:
+                    mu = new_dist + other_dist[to]
+                    meet = to
+                if visited[side][to] or new_dist >= this_dist[to]:
+                    continue
+                prev[side][to] = node_id
+                this_dist[to] = new_dist
+                if not ipq.contains(to):
+                    ipq.insert(to, new_dist)
+                else:
+                    ipq.decrease_key(to, new_dist)
+
+        if mu == inf:
+            return inf, []
+        # walk back from the meeting node to the start node, then forward to the end node
+        path = []
+        at = meet
+        while at != -1:
+            path.append(at)
+            at = prev[0][at]
+        path.reverse()
+        at = prev[1][meet]
+        while at != -1:
+            path.append(at)
+            at = prev[1][at]
+        return mu, path
+
+
+solver = BidirectionalDijkstra(6)
+for frm, to, cost in [(0, 1, 5), (0, 2, 1), (1, 2, 2), (2, 1, 3), (1, 3, 3), (2, 4, 12), (1, 4, 20),
+                      (3, 4, 2), (4, 5, 6)]:
+    solver.add_edge(frm, to, cost)
+print(solver.shortest_path(0, 5)) # (15, [0, 2, 1, 3, 4, 5])
+
+
+
+
+
+
+# A* SEARCH
+
+# Dijkstra's algorithm is an uninformed search: it grows a ball around the start node in every
+# direction, even directions leading away from the end node. A* guides the search with a
+# HEURISTIC h(node), an estimate of the remaining distance from 'node' to the end node. Instead
+# of the distance from the start node g(node), the IPQ is ordered by f(node) = g(node) + h(node),
+# so the nodes which look closer to the end node are explored first. Dijkstra's algorithm is the
+# special case h(node) = 0.
+# The shortest path is only guaranteed when the heuristic never overestimates the remaining
+# distance (an ADMISSIBLE heuristic). When it is also CONSISTENT (h(a) <= cost(a, b) + h(b) for
+# every edge) a node is never polled twice. Otherwise a node whose g value improves after it
+# was polled is simply inserted into the IPQ again.
+# TIE BREAKING: On grids, many nodes have the same f value (eg: every cell inside the rectangle
+# spanned by the start and end cells of an open grid with the manhattan heuristic). Among them,
+# the IPQ prefers the node with the smallest h value, the one closest to the end node, by
+# storing (f, h) pairs as IPQ values. Without this, A* would explore that whole rectangle.
+
+# Common heuristics for grids, where (r, c) are the row and column of a cell:
+#   * MANHATTAN: |dr| + |dc|, for grids with moves in 4 directions (north, south, east, west)
+#   * OCTILE: |dr| + |dc| + (sqrt(2) - 2) * min(|dr|, |dc|), for grids which also allow moving
+#     diagonally at a cost of sqrt(2): as many diagonal moves as possible, then straight moves
+#   * EUCLIDEAN: sqrt(dr^2 + dc^2), the straight line distance, for any-angle movement. It is
+#     admissible on grids as well but a looser estimate than the two above, so A* explores more
+
+# The state of a search (the IPQ, the g values and the 'prev' array) is sized for the whole
+# graph. Allocating it again for every query would cost more than the search itself on large
+# grids, so AStarSearch keeps it between queries and only resets the entries which the last
+# query touched.
+
+import math
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def octile(a, b):
+    dr, dc = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return dr + dc + (math.sqrt(2) - 2) * min(dr, dc)
+
+
+def euclidean(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+class AStarSearch:
+    # n - number of nodes (or cells) in the graph, degree - degree of the D-ary heap IPQ
+    def __init__(self, n, degree=4):
+        self.n = n
+        self.ipq = MinIndexedDHeap(degree, n)
+        self.g = array('d', [float('inf')]) * n
+        self.prev = array('i', [-1]) * n
+        self.touched = []
+
+    # Returns a (distance, path) pair for the shortest path from 'start' to 'end' inclusive.
+    # neighbours(node) - returns the (to, cost) pairs of the edges out of 'node'
+    # heuristic(node) - estimate of the distance from 'node' to 'end'
+    # The distance is positive infinity and the path is empty if 'end' is unreachable.
+    def search(self, start, end, neighbours, heuristic):
+        ipq, g, prev, touched = self.ipq, self.g, self.prev, self.touched
+        try:
+            g[start] = 0
+            touched.append(start)
+            h = heuristic(start)
+            ipq.insert(start, (h, h))
+            found = False
+            while not ipq.is_empty():
+                node_id, _ = ipq.poll_min()
+                if node_id == end:
+                    found = True
+                    break
+                node_g = g[node_id]
+                for to, cost in neighbours(node_id):
+                    new_g = node_g + cost
+                    if new_g >= g[to]:
+                        continue
+                    if g[to] == float('inf'):
+                        touched.append(to)
+                    g[to] = new_g
+                    prev[to] = node_id
+                    h = heuristic(to)
+                    if ipq.contains(to):
+                        ipq.decrease_key(to, (new_g + h, h))
+                    else:
+                        ipq.insert(to, (new_g + h, h))
+
+            dist, path = float('inf'), []
+            if found:
+                dist = g[end]
+                at = end
+                while at != start:
+                    path.append(at)
+                    at = prev[at]
+                path.append(start)
+                path.reverse()
+            return dist, path
+        finally:
+            # forget this query so that the next one starts from a clean state, even if
+            # 'neighbours' or 'heuristic' raised
+            ipq.reset(touched)
+            for node in touched:
+                g[node] = float('inf')
+                prev[node] = -1
+            touched.clear()
+
+
+class AStarSolver(DijkstrasShortestPathEager):
+    def __init__(self, n):
+        super().__init__(n)
+        self.search = None
+
+    # Returns a (distance, path) pair for the shortest path from 'start' to 'end' inclusive.
+    # heuristic(node, end) - estimate of the distance from 'node' to 'end'. Without a heuristic,
+    # this is Dijkstra's algorithm with early stopping.
+    def a_star(self, start, end, heuristic=None):
+        if start < 0 or start >= self.n or end < 0 or end >= self.n:
+            raise IndexError('Invalid node index')
+        if self.search is None:
+            self.search = AStarSearch(self.n, max(2, self.edge_count // self.n))
+        h = (lambda node: 0) if heuristic is None else (lambda node: heuristic(node, end))
+        return self.search.search(start, end, self.graph.__getitem__, h)
+
+
+class GridAStar:
+    # 'grid' - 2D array where non zero cells are blocked
+    # 'diagonal' - also allow diagonal moves at a cost of sqrt(2). Diagonal moves may not cut
+    # the corner of a blocked cell (both straight cells next to the move must be open).
+    # 'heuristic' - function of two (r, c) cells, defaults to octile with diagonal moves and to
+    # manhattan without
+    def __init__(self, grid, diagonal=False, heuristic=None):
+        grid = np.asarray(grid)
+        rows, cols = grid.shape
+        # pad the grid with blocked cells so that no move leaves the grid (see GridBFS)
+        self.cols = cols + 2
+        open_cells = np.zeros((rows + 2, cols + 2), dtype=bool)
+        open_cells[1:-1, 1:-1] = grid == 0
+        self.open_cells = bytearray(open_cells.ravel().tobytes())
+        self.heuristic = heuristic or (octile if diagonal else manhattan)
+        C = self.cols
+        # (offset, cost, straight offsets which must be open)
+        self.moves = [(-C, 1, ()), (C, 1, ()), (-1, 1, ()), (1, 1, ())]
+        if diagonal:
+            for dr in (-C, C):
+                for dc in (-1, 1):
+                    self.moves.append((dr + dc, math.sqrt(2), (dr, dc)))
+        self.search = AStarSearch(len(self.open_cells))
+
+    # Returns a (distance, path) pair for the shortest path between the (r, c) cells 'start' and
+    # 'end', where the path is a list of (r, c) cells
+    def shortest_path(self, start, end):
+        for r, c in (start, end):
+            if not self.open_cells[(r + 1) * self.cols + c + 1]:
+                raise ValueError('Start and end cells must be open cells of the grid')
+        C, open_cells, moves = self.cols, self.open_cells, self.moves
+
+        def neighbours(at):
+            for offset, cost, straight in moves:
+                to = at + offset
+                if open_cells[to] and all(open_cells[at + s] for s in straight):
+                    yield to, cost
+
+        heuristic, target = self.heuristic, (end[0] + 1, end[1] + 1)
+        dist, path = self.search.search((start[0] + 1) * C + start[1] + 1, (end[0] + 1) * C + end[1] + 1,
+                                        neighbours, lambda at: heuristic(divmod(at, C), target))
+        return dist, [(at // C - 1, at % C - 1) for at in path]
+
+
+solver = AStarSolver(6)
+for frm, to, cost in [(0, 1, 5), (0, 2, 1), (1, 2, 2), (2, 1, 3), (1, 3, 3), (2, 4, 12), (1, 4, 20),
+                      (3, 4, 2), (4, 5, 6)]:
+    solver.add_edge(frm, to, cost)
+print(solver.a_star(0, 5)) # (15.0, [0, 2, 1, 3, 4, 5])
+
+
+# A query aborted by its heuristic halfway doesn't leave any state behind for the next one
+def failing_heuristic(node, end):
+    if node == 3:
+        raise RuntimeError('heuristic failed')
+    return 0
+
+
+try:
+    solver.a_star(0, 5, failing_heuristic)
+except RuntimeError:
+    pass
+print(solver.a_star(0, 5)) # (15.0, [0, 2, 1, 3, 4, 5])
+
+# The dungeon from 'graph-breadth-first-search.py' with 'S' at (0, 0) and the exit at (4, 3)
+dungeon = np.array([[0, 0, 0, 1, 0, 0, 0],
+                    [0, 1, 0, 0, 0, 1, 0],
+                    [0, 1, 0, 0, 0, 0, 0],
+                    [0, 0, 1, 1, 0, 0, 0],
+                    [1, 0, 1, 0, 0, 1, 0]])
+print(GridAStar(dungeon).shortest_path((0, 0), (4, 3))[0]) # 9.0
+print(GridAStar(dungeon, diagonal=True).shortest_path((0, 0), (4, 3))[0]) # 8.414213562373096
+
+
+
+
+
+
 # BELLMAN-FORD ALGORITHM
 
 
@@ -843,6 +1636,161 @@ public class BellmanFordEdgeList {
 
 
 
+# PYTHON IMPLEMENTATION OF THE BELLMAN-FORD ALGORITHM OVER A COLUMNAR EDGE LIST
+
+# Instead of an array of Edge objects, the edges are stored "column by column" in three NumPy
+# arrays of length E: 'src' (edge.from), 'dst' (edge.to) and 'cost' (edge.cost). This lets us
+# relax every edge of the graph with a handful of vectorized operations instead of a Python loop:
+#   * candidate = dist[src] + cost gives the new distance offered by every edge at once.
+#   * Several edges can point to the same node, so we need the minimum candidate per 'dst'.
+#   The edges are sorted by 'dst' once up front, which groups the edges of every node together,
+#   and np.minimum.reduceat() then takes the minimum of each group in a single call.
+# Note that this relaxes all the edges against the distances of the previous pass (rather than
+# picking up improvements made earlier in the same pass like the Java source does). After 'i'
+# passes, dist[v] is still at most the length of the shortest path to 'v' using 'i' edges, so
+# V - 1 passes are still enough.
+
+# EARLY EXIT:
+# If a whole pass over the edges does not improve any distance, no later pass can either, so we
+# can stop right there. On most real graphs this happens long before V - 1 passes, since the
+# number of passes needed is only the number of edges on the longest shortest path. A graph
+# which stops early cannot have a negative cycle reachable from the start node.
+
+# SPFA (SHORTEST PATH FASTER ALGORITHM):
+# A queue based variant of Bellman-Ford. Only the nodes whose distance changed are put on a
+# queue, and only their outgoing edges are relaxed, instead of every edge on every pass. The
+# worst case is still O(V * E) but on average it relaxes far fewer edges. A negative cycle is
+# detected when the shortest path to a node is found to have V or more edges; such a node is
+# set to negative infinity, which then propagates along its outgoing edges through the queue.
+
+# NEGATIVE CYCLES:
+# After V - 1 passes, one more pass is made. Any node that still improves is part of, or is
+# reachable from, a negative cycle. Every node reachable from those nodes is set to negative
+# infinity with a BFS over the edges (grouped by 'src' for fast neighbour lookups), instead of
+# repeating the V - 1 passes like the Java source does.
+
+from collections import deque
+
+
+class BellmanFordSolver:
+    # n - number of nodes, src/dst/cost - the columns of the edge list
+    def __init__(self, n, src, dst, cost):
+        self.n = n
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        cost = np.asarray(cost, dtype=np.float64)
+        # edges grouped by destination node, for the vectorized relaxation
+        order = np.argsort(dst, kind='stable')
+        self.in_src = src[order]
+        self.in_cost = cost[order]
+        sorted_dst = dst[order]
+        # index of the first edge of every group, ie. wherever the destination node changes
+        new_group = np.ones(len(sorted_dst), dtype=bool)
+        new_group[1:] = sorted_dst[1:] != sorted_dst[:-1]
+        self.group_starts = np.flatnonzero(new_group)
+        self.group_dst = sorted_dst[self.group_starts]
+        # edges grouped by source node (CSR form), for SPFA and negative cycle propagation
+        order = np.argsort(src, kind='stable')
+        self.out_offsets = np.searchsorted(src[order], np.arange(n + 1)).tolist()
+        self.out_dst = dst[order].tolist()
+        self.out_cost = cost[order].tolist()
+
+    # Builds the solver from (from, to, cost) tuples
+    @classmethod
+    def from_edges(cls, n, edges):
+        src, dst, cost = zip(*edges) if edges else ((), (), ())
+        return cls(n, src, dst, cost)
+
+    # Returns the array of shortest distances from 'start' to every node. Nodes that are part
+    # of, or reachable from, a negative cycle have a distance of negative infinity.
+    # mode - 'vectorized' (relax all edges per pass) or 'spfa' (queue based)
+    # early_exit - stop the vectorized passes as soon as a pass changes nothing
+    def bellman_ford(self, start, mode='vectorized', early_exit=True):
+        if mode == 'vectorized':
+            return self._vectorized(start, early_exit)
+        if mode == 'spfa':
+            return self._spfa(start)
+        raise ValueError('unknown mode: ' + str(mode))
+
+    # Relaxes every edge once. Returns the nodes whose distance improved.
+    def _relax_all(self, dist):
+        if len(self.group_starts) == 0:
+            return self.group_dst
+        candidate = dist[self.in_src] + self.in_cost
+        best = np.minimum.reduceat(candidate, self.group_starts)
+        improved = best < dist[self.group_dst]
+        nodes = self.group_dst[improved]
+        dist[nodes] = best[improved]
+        return nodes
+
+    def _vectorized(self, start, early_exit):
+        dist = np.full(self.n, np.inf)
+        dist[start] = 0
+        for _ in range(self.n - 1):
+            if len(self._relax_all(dist)) == 0 and early_exit:
+                return dist
+        # one more pass: anything that still improves is affected by a negative cycle
+        affected = self._relax_all(dist)
+        if len(affected):
+            self._propagate_negative_infinity(dist, affected.tolist())
+        return dist
+
+    def _propagate_negative_infinity(self, dist, nodes):
+        offsets, out_dst = self.out_offsets, self.out_dst
+        seen = bytearray(self.n)
+        q = deque()
+        for node in nodes:
+            if not seen[node]:
+                seen[node] = 1
+                q.append(node)
+        while q:
+            at = q.popleft()
+            dist[at] = -np.inf
+            for j in range(offsets[at], offsets[at + 1]):
+                to = out_dst[j]
+                if not seen[to]:
+                    seen[to] = 1
+                    q.append(to)
+
+    def _spfa(self, start):
+        n, offsets, out_dst, out_cost = self.n, self.out_offsets, self.out_dst, self.out_cost
+        inf = float('inf')
+        dist = [inf] * n
+        edge_count = [0] * n # number of edges on the current shortest path to each node
+        in_queue = bytearray(n)
+        dist[start] = 0
+        q = deque([start])
+        in_queue[start] = 1
+        while q:
+            at = q.popleft()
+            in_queue[at] = 0
+            d = dist[at]
+            for j in range(offsets[at], offsets[at + 1]):
+                to = out_dst[j]
+                new_dist = d + out_cost[j]
+                if new_dist < dist[to]:
+                    edge_count[to] = edge_count[at] + 1
+                    # a shortest path with V or more edges must go around a negative cycle
+                    dist[to] = -inf if edge_count[to] >= n else new_dist
+                    if not in_queue[to]:
+                        in_queue[to] = 1
+                        q.append(to)
+        return np.array(dist)
+
+
+# The graph from the BELLMAN-FORD ALGORITHM IN ACTION example above
+edges = [(0, 1, 5), (1, 2, 20), (1, 5, 30), (1, 6, 60), (2, 3, 10), (3, 2, -15), (2, 4, 75),
+         (4, 9, 100), (5, 4, 25), (5, 6, 5), (5, 8, 50), (6, 7, -50), (7, 8, -10)]
+solver = BellmanFordSolver.from_edges(10, edges)
+print(solver.bellman_ford(0)) # [  0.   5. -inf -inf -inf  35.  40. -10. -20. -inf]
+print(solver.bellman_ford(0, mode='spfa')) # [  0.   5. -inf -inf -inf  35.  40. -10. -20. -inf]
+print(solver.bellman_ford(5, early_exit=False)) # [ inf  inf  inf  inf  25.   0.   5. -45. -55. 125.]
+
+
+
+
+
+
 # FLOYD-WARSHALL ALL PAIRS SHORTEST PATH ALGORTIHM
 
 
@@ -1160,6 +2108,177 @@ public class FloydWarshallSolver {
 
 
 
+# PYTHON IMPLEMENTATION OF THE FLOYD-WARSHALL ALGORITHM USING NUMPY
+
+# A direct Python port of the triple loop above runs the innermost statement V^3 times in the
+# interpreter, which is only bearable up to a few hundred nodes. Notice however that for a fixed
+# 'k', every cell of the 'dp' matrix is updated independently of the other cells:
+#       dp[i][j] = min(dp[i][j], dp[i][k] + dp[k][j])
+# Column 'k' of 'dp' (the dp[i][k] values) plus row 'k' of 'dp' (the dp[k][j] values) is an outer
+# sum, which NumPy can compute for all (i, j) pairs at once by broadcasting a column vector of
+# shape (n, 1) against a row vector of shape (1, n). Each k-step then becomes a single vectorized
+# minimum over the whole matrix, leaving only the loop over 'k' in Python. Row 'k' and column 'k'
+# themselves never change during step 'k' (dp[k][k] >= 0 if there is no negative cycle), which
+# is what makes the in-place update safe.
+
+# BLOCKED (TILED) FLOYD-WARSHALL:
+# For large matrices (5000 x 5000 doubles = 200MB) every k-step streams the whole 'dp' matrix
+# (plus the temporary matrices of the same size created by the broadcast) through the CPU cache.
+# The blocked variant splits the rows of the matrix into strips of B rows and processes the k
+# values one block of B at a time:
+#   * Phase 1 - apply the B k-steps of block kb to the strip of rows that contains those k rows.
+#   Afterwards, rows 'k' for every 'k' in the block are final for this round.
+#   * Phase 2 - apply the same B k-steps to each of the other strips. A strip only reads its own
+#   rows and the k rows from phase 1, so it stays in cache for all B k-steps instead of being
+#   evicted between them.
+# In the plain version, step 'k' reads row 'k' as it is after the steps before 'k'. Phase 1 also
+# applies the later k-steps of the block to row 'k', so it keeps a copy of every k row taken at its
+# own step, and phase 2 reads those copies. Every row then goes through exactly the same updates as
+# in the plain version, so 'dp' and 'next' are identical to the plain version's (ties included,
+# which keeps the 'next' pointers free of cycles when the graph has zero weight cycles).
+
+# NEGATIVE CYCLES:
+# After the main loop, a node 'k' lies on a negative cycle exactly when dp[k][k] < 0. A pair
+# (i, j) has an infinite number of shortest paths when 'i' can reach some such 'k' and 'k' can
+# reach 'j'. Instead of repeating the O(V^3) loop, this check is one boolean matrix product of
+# the reachability columns and rows of the negative cycle nodes.
+
+
+class FloydWarshallSolver:
+    REACHES_NEGATIVE_CYCLE = -2
+    NO_PATH = -1
+
+    # 'matrix' is an n x n adjacency matrix (nested lists or a NumPy array) where positive
+    # infinity means that two nodes are not connected. Pass 'block_size' to use the blocked
+    # variant of the algorithm.
+    def __init__(self, matrix, block_size=None):
+        self.dp = np.array(matrix, dtype=np.float64)
+        self.n = self.dp.shape[0]
+        if self.dp.shape != (self.n, self.n):
+            raise ValueError('matrix must be square')
+        self.block_size = block_size
+        # next[i][j] is the node that follows 'i' on the shortest path from 'i' to 'j'
+        self.next = np.where(np.isfinite(self.dp), np.arange(self.n), self.NO_PATH)
+        self.solved = False
+
+    def get_apsp_matrix(self):
+        if not self.solved:
+            self.solve()
+        return self.dp
+
+    def solve(self):
+        if self.block_size is None:
+            self._relax(0, self.n, 0, self.n)
+        else:
+            self._solve_blocked(self.block_size)
+        self._propagate_negative_cycles()
+        self.solved = True
+
+    # Applies the k-steps k0 <= k < k1 to the strip of rows i0 <= i < i1, one k at a time.
+    # 'pivots[k - k0]' replaces row 'k' of 'dp' when given.
+    def _relax(self, i0, i1, k0, k1, pivots=None):
+        dp, nxt = self.dp, self.next
+        strip = dp[i0:i1]
+        next_strip = nxt[i0:i1]
+        for k in range(k0, k1):
+            pivot = dp[k] if pivots is None else pivots[k - k0]
+            # dp[i][k] + dp[k][j] for every (i, j) in the strip
+            via = strip[:, k, None] + pivot[None]
+            improved = via < strip
+            np.copyto(strip, via, where=improved)
+            np.copyto(next_strip, next_strip[:, k, None], where=improved)
+
+    def _solve_blocked(self, b):
+        blocks = [(start, min(start + b, self.n)) for start in range(0, self.n, b)]
+        pivots = np.empty((b, self.n))
+        for k0, k1 in blocks:
+            # Phase 1: the strip holding the k rows of this block, saving row 'k' before step 'k'
+            for k in range(k0, k1):
+                pivots[k - k0] = self.dp[k]
+                self._relax(k0, k1, k, k + 1)
+            # Phase 2: every other strip
+            for i0, i1 in blocks:
+                if i0 != k0:
+                    self._relax(i0, i1, k0, k1, pivots)
+
+    def _propagate_negative_cycles(self):
+        dp = self.dp
+        on_negative_cycle = np.diagonal(dp) < 0
+        if not on_negative_cycle.any():
+            return
+        reachable = np.isfinite(dp).astype(np.float32)
+        # affected[i][j] > 0 when i -> k -> j for some node 'k' on a negative cycle
+        affected = reachable[:, on_negative_cycle] @ reachable[on_negative_cycle, :] > 0
+        dp[affected] = -np.inf
+        self.next[affected] = self.REACHES_NEGATIVE_CYCLE
+
+    # Reconstructs the shortest path (of nodes) from 'start' to 'end' inclusive. Returns an
+    # empty list if 'start' and 'end' are not connected, and None if there are an infinite
+    # number of shortest paths because of a negative cycle.
+    def reconstruct_shortest_path(self, start, end):
+        if not self.solved:
+            self.solve()
+        path = []
+        if self.dp[start, end] == np.inf:
+            return path
+        at = start
+        while at != end:
+            if at == self.REACHES_NEGATIVE_CYCLE:
+                return None
+            # a shortest path visits every node at most once
+            if len(path) == self.n:
+                raise RuntimeError('Shortest path from %d to %d loops' % (start, end))
+            path.append(int(at))
+            at = self.next[at, end]
+        if self.next[at, end] == self.REACHES_NEGATIVE_CYCLE:
+            return None
+        path.append(end)
+        return path
+
+
+# Same example as the Java source above
+n = 7
+m = np.full((n, n), np.inf)
+np.fill_diagonal(m, 0)
+m[0, 1] = 2
+m[0, 2] = 5
+m[0, 6] = 10
+m[1, 2] = 2
+m[1, 4] = 11
+m[2, 6] = 2
+m[6, 5] = 11
+m[4, 5] = 1
+m[5, 5] = -2
+
+solver = FloydWarshallSolver(m)
+print(solver.get_apsp_matrix()[0]) # [  0.   2.   4.  inf  13. -inf   6.]
+print(solver.reconstruct_shortest_path(0, 6)) # [0, 1, 2, 6]
+print(solver.reconstruct_shortest_path(0, 3)) # []
+print(solver.reconstruct_shortest_path(0, 5)) # None
+
+blocked_solver = FloydWarshallSolver(m, block_size=3)
+print(np.array_equal(blocked_solver.get_apsp_matrix(), solver.get_apsp_matrix())) # True
+
+# Zero weight cycles (1 -> 3 -> 4 -> 1) and no negative cycle: the blocked variant gives the same
+# 'next' pointers as the plain one, so path reconstruction doesn't loop
+m = np.full((n, n), np.inf)
+np.fill_diagonal(m, 0)
+for frm, to, weight in [(1, 3, 1), (2, 5, 0), (3, 2, -1), (3, 4, -1), (4, 0, 0), (4, 1, 0),
+                        (5, 0, -1), (6, 4, 0)]:
+    m[frm, to] = weight
+blocked_solver = FloydWarshallSolver(m, block_size=2)
+print(blocked_solver.reconstruct_shortest_path(1, 0)) # [1, 3, 2, 5, 0]
+solver = FloydWarshallSolver(m)
+solver.solve()
+print(np.array_equal(blocked_solver.next, solver.next)) # True
+
+
+
+
+
+
+
+
 # BRIDGES AND ARTICULATION POINTS
 
 
@@ -1748,6 +2867,336 @@ public static void main(String[] args) {
 
 
 
+# PYTHON IMPLEMENTATION: BRIDGES, ARTICULATION POINTS AND BICONNECTED COMPONENTS IN ONE PASS
+
+# The two Java sources above run two separate recursive DFS passes. Both look at exactly the same
+# 'ids' and 'low' values, so one iterative DFS (explicit stack and per-node edge cursors, like the
+# iterative Tarjan SCC solver below) can answer both questions at once, and also split the edges
+# into Biconnected Components (BCCs, also called blocks). A block is a maximal set of edges where
+# any two edges lie on a common simple cycle, so removing any single node leaves the block in one
+# piece. Every edge belongs to exactly one block and:
+#   * a bridge is a block made of a single edge.
+#   * an articulation point is a node that belongs to two or more blocks.
+# To collect the blocks, every edge is pushed onto an edge stack when it is first walked. When the
+# DFS returns from 'to' to 'at' and ids[at] <= low[to] (the articulation point condition from the
+# Java source), the edges on top of the stack down to the edge (at, to) form one block.
+# Parallel edges are told apart by an edge index, so only the edge used to reach a node is skipped
+# (rather than every edge back to the parent node), which correctly stops parallel edges from
+# being reported as bridges. Self loops never affect connectivity and are ignored.
+
+# INCREMENTAL UPDATES - THE BLOCK-CUT TREE:
+# Draw one node for every block and one node for every articulation point, and connect each
+# articulation point to the blocks that contain it. This graph is a forest (one tree for every
+# connected component) called the block-cut tree.
+"""
+         GRAPH                              BLOCK-CUT TREE
+
+    0                   6
+  /   \               /   \            B0 {0-1, 0-2, 1-2}
+ 1 --- 2 ----------- 5     7            |
+      /               \   /            (2) ---- B1 {2-3} ---- (3) ---- B2 {3-4}
+     3 ----- 4          8               |
+                                       B3 {2-5} ---- (5) ---- B4 {5-6, 6-7, 7-8, 8-5}
+"""
+# Adding one edge (u, v) only changes the part of this tree between u and v:
+#   * If u and v are in different trees, the new edge is a new bridge block that links the two
+#   trees together. u (and v) become articulation points if they already had another edge.
+#   * If u and v are in the same tree, the new edge closes a cycle through every block on the
+#   tree path between them, so all those blocks merge into a single block. Any bridge on that
+#   path stops being a bridge, and an articulation point inside the path loses one block (it
+#   stops being an articulation point if that leaves it with a single block).
+# Each tree is stored with parent pointers, and merged nodes are combined with a union-find
+# (disjoint set) structure, so a query walks only the tree path between u and v. Every node
+# walked over inside a tree is merged away, so the total work over many insertions stays close
+# to linear, instead of a new O(V + E) DFS after every change.
+
+
+class BiconnectivitySolver:
+    # n - number of nodes in the undirected graph
+    def __init__(self, n):
+        self.n = n
+        self.edges_u = array('i')
+        self.edges_v = array('i')
+        self.graph = [[] for _ in range(n)] # graph[v] holds the indexes of the edges of 'v'
+        self.solved = False
+
+    def add_edge(self, u, v):
+        e = len(self.edges_u)
+        self.edges_u.append(u)
+        self.edges_v.append(v)
+        self.graph[u].append(e)
+        if u != v:
+            self.graph[v].append(e)
+        if self.solved:
+            self._insert(e, u, v)
+        return e
+
+    def bridges(self):
+        if not self.solved:
+            self.solve()
+        return sorted(self._edge(edges[0]) for b, edges in self._blocks() if len(edges) == 1)
+
+    def articulation_points(self):
+        if not self.solved:
+            self.solve()
+        return [v for v in range(self.n) if self.block_count[v] >= 2]
+
+    # Returns every biconnected component as a sorted list of its (u, v) edges
+    def biconnected_components(self):
+        if not self.solved:
+            self.solve()
+        return sorted(sorted(self._edge(e) for e in edges) for b, edges in self._blocks())
+
+    def _edge(self, e):
+        u, v = self.edges_u[e], self.edges_v[e]
+        return (u, v) if u < v else (v, u)
+
+    def _blocks(self):
+        for b, edges in enumerate(self.block_edges):
+            if edges is not None and self.uf[b] == b:
+                yield b, edges
+
+    def solve(self):
+        n, graph, edges_u, edges_v = self.n, self.graph, self.edges_u, self.edges_v
+        num_edges = len(edges_u)
+        UNVISITED = -1
+        ids = array('i', [UNVISITED]) * n
+        low = array('i', [0]) * n
+        edge_index = array('i', [0]) * n
+        parent_edge = array('i', [-1]) * n
+        block_of_edge = array('i', [-1]) * num_edges
+        block_head = [] # the node from which the DFS entered each block
+        block_edges = []
+        edge_stack = []
+        next_id = 0
+
+        for root in range(n):
+            if ids[root] != UNVISITED:
+                continue
+            ids[root] = low[root] = next_id
+            next_id += 1
+            call_stack = [root]
+            while call_stack:
+                at = call_stack[-1]
+                i = edge_index[at]
+                if i < len(graph[at]):
+                    edge_index[at] = i + 1
+                    e = graph[at][i]
+                    to = edges_u[e] if edges_v[e] == at else edges_v[e]
+                    if e == parent_edge[at] or to == at:
+                        continue
+                    if ids[to] == UNVISITED:
+                        # tree edge: "recursive call" on 'to'
+                        edge_stack.append(e)
+                        parent_edge[to] = e
+                        ids[to] = low[to] = next_id
+                        next_id += 1
+                        call_stack.append(to)
+                    elif ids[to] < ids[at]:
+                        # back edge to an ancestor (only pushed from the deeper end)
+                        edge_stack.append(e)
+                        if ids[to] < low[at]:
+                            low[at] = ids[to]
+                    continue
+
+                # "return" from the dfs() call on 'at' to its parent
+                call_stack.pop()
+                if not call_stack:
+                    break
+                parent = call_stack[-1]
+                if low[at] < low[parent]:
+                    low[parent] = low[at]
+                if ids[parent] <= low[at]:
+                    # the edges above (parent, at) on the edge stack form a block
+                    b = len(block_edges)
+                    edges = []
+                    while True:
+                        e = edge_stack.pop()
+                        block_of_edge[e] = b
+                        edges.append(e)
+                        if e == parent_edge[at]:
+                            break
+                    block_edges.append(edges)
+                    block_head.append(parent)
+
+        # Build the block-cut forest. Node ids [0, number of blocks) are the blocks, and a new
+        # node is created for every articulation point.
+        num_blocks = len(block_edges)
+        self.uf = list(range(num_blocks))
+        self.bc_parent = [-1] * num_blocks
+        self.cut_vertex = [-1] * num_blocks # the graph node of every articulation point node
+        self.block_edges = block_edges
+        self.block_count = array('i', [0]) * n
+        self.vnode = array('i', [-1]) * n # the block-cut tree node of every graph node
+        self.components = list(range(n)) # union-find over the graph nodes, for connectivity
+        for v in range(n):
+            blocks = {block_of_edge[e] for e in graph[v] if block_of_edge[e] != -1}
+            self.block_count[v] = len(blocks)
+            if len(blocks) == 1:
+                self.vnode[v] = blocks.pop()
+            elif len(blocks) > 1:
+                home = block_of_edge[parent_edge[v]] if parent_edge[v] != -1 else -1
+                self.vnode[v] = self._new_node(home, cut_vertex=v)
+            e = parent_edge[v]
+            if e != -1:
+                p = edges_u[e] if edges_v[e] == v else edges_v[e]
+                self.components[self._find_component(v)] = self._find_component(p)
+        for b in range(num_blocks):
+            head = block_head[b]
+            if self.block_count[head] >= 2:
+                self.bc_parent[b] = self.vnode[head]
+        self.solved = True
+
+    # Adds a node to the block-cut forest: a block, or the articulation point of 'cut_vertex'
+    def _new_node(self, parent, cut_vertex=-1):
+        x = len(self.uf)
+        self.uf.append(x)
+        self.bc_parent.append(parent)
+        self.cut_vertex.append(cut_vertex)
+        self.block_edges.append([] if cut_vertex == -1 else None)
+        return x
+
+    def _find(self, x):
+        uf = self.uf
+        while uf[x] != x:
+            uf[x] = uf[uf[x]] # path halving
+            x = uf[x]
+        return x
+
+    def _find_component(self, v):
+        comp = self.components
+        while comp[v] != v:
+            comp[v] = comp[comp[v]]
+            v = comp[v]
+        return v
+
+    def _parent(self, x):
+        p = self.bc_parent[x]
+        return -1 if p == -1 else self._find(p)
+
+    # Returns the articulation point node of 'v' in the block-cut tree, turning 'v' into an
+    # articulation point if needed, and records that 'v' gained one more block.
+    def _cut_node_for(self, v):
+        self.block_count[v] += 1
+        x = self._find(self.vnode[v])
+        if self.cut_vertex[x] != -1:
+            return x
+        cut = self._new_node(x, cut_vertex=v)
+        self.vnode[v] = cut
+        return cut
+
+    # Reverses the parent pointers on the path from 'x' to its root, making 'x' the root
+    def _reroot(self, x):
+        prev = -1
+        while x != -1:
+            p = self._parent(x)
+            self.bc_parent[x] = prev
+            prev, x = x, p
+
+    def _insert(self, e, u, v):
+        if u == v:
+            return
+        cu, cv = self._find_component(u), self._find_component(v)
+        if cu != cv:
+            # a new bridge joining two trees of the block-cut forest
+            self.components[cu] = cv
+            block = self._new_node(-1)
+            self.block_edges[block].append(e)
+            if self.vnode[u] == -1:
+                self.vnode[u] = block
+                self.block_count[u] = 1
+            else:
+                self.bc_parent[block] = self._cut_node_for(u)
+            if self.vnode[v] == -1:
+                self.vnode[v] = block
+                self.block_count[v] = 1
+            else:
+                cut = self._cut_node_for(v)
+                self._reroot(cut)
+                self.bc_parent[cut] = block
+            return
+
+        a, b = self._find(self.vnode[u]), self._find(self.vnode[v])
+        if a == b:
+            self.block_edges[a].append(e)
+            return
+
+        # Walk up from both ends one step at a time until the walks meet at their lowest common
+        # ancestor. Alternating the steps means neither side walks much past the meeting point.
+        paths = ([a], [b])
+        seen = {a: 0, b: 1}
+        active = [True, True]
+        meet = -1
+        while meet == -1:
+            for side in (0, 1):
+                if not active[side]:
+                    continue
+                p = self._parent(paths[side][-1])
+                if p == -1:
+                    active[side] = False
+                    continue
+                if seen.get(p, side) != side:
+                    meet = p
+                    break
+                seen[p] = side
+                paths[side].append(p)
+        other = paths[1 - side]
+        path = paths[side] + other[:other.index(meet) + 1][::-1]
+
+        # merge every block on the path (and every articulation point that loses its last
+        # extra block) into one block
+        top_parent = self._parent(meet)
+        merged = []
+        kept_cuts = []
+        for i, x in enumerate(path):
+            w = self.cut_vertex[x]
+            if w == -1:
+                merged.append(x)
+                continue
+            if 0 < i < len(path) - 1:
+                # an articulation point inside the path: two of its blocks become one
+                self.block_count[w] -= 1
+                if self.block_count[w] < 2:
+                    merged.append(x)
+                    continue
+            kept_cuts.append(x)
+        merged.sort(key=lambda x: -len(self.block_edges[x] or ()))
+        block = merged[0]
+        for x in merged[1:]:
+            self.uf[x] = block
+            if self.block_edges[x]:
+                self.block_edges[block].extend(self.block_edges[x])
+            self.block_edges[x] = None
+        self.block_edges[block].append(e)
+        if meet in kept_cuts:
+            self.bc_parent[block] = meet
+        else:
+            self.bc_parent[block] = top_parent
+        for x in kept_cuts:
+            if x != meet:
+                self.bc_parent[x] = block
+
+
+# Same example as the Java sources above
+bcc_solver = BiconnectivitySolver(9)
+for u, v in [(0, 1), (0, 2), (1, 2), (2, 3), (3, 4), (2, 5), (5, 6), (6, 7), (7, 8), (8, 5)]:
+    bcc_solver.add_edge(u, v)
+print(bcc_solver.bridges()) # [(2, 3), (2, 5), (3, 4)]
+print(bcc_solver.articulation_points()) # [2, 3, 5]
+print(len(bcc_solver.biconnected_components())) # 5
+
+# Closing the cycle 0 -> 2 -> 3 -> 4 -> 0 merges three blocks without a new DFS
+bcc_solver.add_edge(4, 0)
+print(bcc_solver.bridges()) # [(2, 5)]
+print(bcc_solver.articulation_points()) # [2, 5]
+print(bcc_solver.biconnected_components()[0]) # [(0, 1), (0, 2), (0, 4), (1, 2), (2, 3), (3, 4)]
+
+
+
+
+
+
+
 # TARJAN'S ALGORITHM FOR FINDING STRONGLY CONNECTED COMPONENTS
 
 
@@ -2043,6 +3492,149 @@ public class TarjanSccSolverAdjacencyList {
 
 
 
+# PYTHON IMPLEMENTATION OF TARJAN'S ALGORITHM WITHOUT RECURSION
+
+# A straight port of the recursive dfs() above fails in Python on any graph with a path longer
+# than about 1000 nodes, since CPython limits the depth of the call stack (the recursion limit) and
+# every nested dfs() call uses one frame. Raising the limit with sys.setrecursionlimit() only
+# moves the problem: a deep enough graph will crash the interpreter itself.
+# The iterative version keeps its own stack of nodes whose dfs() call is still "in progress"
+# (the call stack), next to the 'stack' of seen nodes from the Java source. To be able to pause
+# a node while one of its neighbours is explored and resume it afterwards, we remember for every
+# node how far we got through its list of neighbours in an 'edge_index' array. When a node has
+# no neighbours left, it is popped off the call stack, which is the point where the recursive
+# version returns to its caller: the caller then pulls in the low-link value of the node.
+# The 'ids', 'low' and 'edge_index' arrays are typed integer arrays and 'on_stack' is a bytearray,
+# so the memory used per node stays small for graphs with millions of nodes.
+
+# Every SCC is numbered in the order in which it is completed. Tarjan's algorithm completes an
+# SCC only after every SCC reachable from it, so these numbers are a reverse topological order
+# of the condensation DAG (the graph with one node per SCC, and an edge between two SCCs when
+# there is an edge between their nodes).
+
+
+class TarjanSccSolver:
+    UNVISITED = -1
+
+    # 'graph' is an adjacency list: graph[i] holds the nodes reachable from node 'i' by one edge
+    def __init__(self, graph):
+        if graph is None:
+            raise ValueError('Graph cannot be None.')
+        self.n = len(graph)
+        self.graph = graph
+        self.solved = False
+        self.scc_count_ = 0
+        self.sccs = None
+
+    # Returns the number of strongly connected components in the graph
+    def scc_count(self):
+        if not self.solved:
+            self.solve()
+        return self.scc_count_
+
+    # Returns the SCC id of every node. If two nodes have the same id, they are in the same SCC.
+    # The ids range over [0, scc_count) in reverse topological order of the condensation.
+    def get_sccs(self):
+        if not self.solved:
+            self.solve()
+        return self.sccs
+
+    def solve(self):
+        if self.solved:
+            return
+        n, graph, UNVISITED = self.n, self.graph, self.UNVISITED
+        ids = array('i', [UNVISITED]) * n
+        low = array('i', [0]) * n
+        edge_index = array('i', [0]) * n
+        sccs = array('i', [-1]) * n
+        on_stack = bytearray(n)
+        stack = [] # seen nodes which are not yet assigned to an SCC
+        call_stack = [] # nodes whose dfs() "call" is still in progress
+        next_id = 0
+        scc_count = 0
+
+        for start in range(n):
+            if ids[start] != UNVISITED:
+                continue
+            call_stack.append(start)
+            stack.append(start)
+            on_stack[start] = 1
+            ids[start] = low[start] = next_id
+            next_id += 1
+
+            while call_stack:
+                at = call_stack[-1]
+                neighbours = graph[at]
+                i = edge_index[at]
+                if i < len(neighbours):
+                    edge_index[at] = i + 1
+                    to = neighbours[i]
+                    if ids[to] == UNVISITED:
+                        # "recursive call" on the unvisited 'to' node
+                        call_stack.append(to)
+                        stack.append(to)
+                        on_stack[to] = 1
+                        ids[to] = low[to] = next_id
+                        next_id += 1
+                    elif on_stack[to] and ids[to] < low[at]:
+                        low[at] = ids[to]
+                    continue
+
+                # all neighbours of 'at' are done, so "return" from its dfs() call
+                call_stack.pop()
+                if ids[at] == low[at]:
+                    # 'at' is the root of an SCC: pop its nodes off the seen stack
+                    while True:
+                        node = stack.pop()
+                        on_stack[node] = 0
+                        low[node] = ids[at]
+                        sccs[node] = scc_count
+                        if node == at:
+                            break
+                    scc_count += 1
+                if call_stack:
+                    parent = call_stack[-1]
+                    if low[at] < low[parent]:
+                        low[parent] = low[at]
+
+        self.sccs = sccs
+        self.scc_count_ = scc_count
+        self.solved = True
+
+    # Returns the condensation DAG of the graph as an adjacency list over the SCC ids, without
+    # duplicate edges or self loops.
+    def condensation(self):
+        sccs = self.get_sccs()
+        dag = [set() for _ in range(self.scc_count_)]
+        for at in range(self.n):
+            for to in self.graph[at]:
+                if sccs[at] != sccs[to]:
+                    dag[sccs[at]].add(sccs[to])
+        return [sorted(edges) for edges in dag]
+
+
+# Same example as the Java source above
+n = 8
+graph = [[] for _ in range(n)]
+for frm, to in [(6, 0), (6, 2), (3, 4), (6, 4), (2, 0), (0, 1), (4, 5), (5, 6), (3, 7), (7, 5),
+                (1, 2), (7, 3), (5, 0)]:
+    graph[frm].append(to)
+
+scc_solver = TarjanSccSolver(graph)
+print(scc_solver.scc_count()) # 3
+print(scc_solver.get_sccs().tolist()) # [0, 0, 0, 2, 1, 1, 1, 2]
+print(scc_solver.condensation()) # [[], [0], [1]]
+
+# A chain of 100000 nodes which loops back to its start is a single SCC, and would need a
+# recursion depth of 100000 with the recursive version.
+chain = [[i + 1] for i in range(99999)] + [[0]]
+print(TarjanSccSolver(chain).scc_count()) # 1
+
+
+
+
+
+
 # TRAVELLING SALESMAN PROBLEM (TSP) WITH DYNAMIC PROGRAMMING (DP)
 
 # Given a list of cities and the distances between each pair of cities, what is the shortest
@@ -2194,3 +3786,590 @@ function tsp(m, S):
     return (minCost, tour)
 """
 
+
+
+
+# PYTHON IMPLEMENTATION OF TSP WITH DYNAMIC PROGRAMMING USING NUMPY
+
+# MEMORY: The start node 'S' is in every subpath, so its bit does not need to be stored at all.
+# Using a bit field over the other M = N - 1 nodes, the memo table becomes a 2D NumPy array of
+# shape (2^M, M) where memo[mask][j] is the cost of the best subpath which starts at 'S', visits
+# exactly the nodes in 'mask' and ends at node 'j'. A flat typed array of 2^22 * 22 entries uses
+# 369MB as float32 (N = 23), compared to tens of gigabytes for a dictionary or nested lists of
+# Python floats. We don't keep a second table for the previous node of every state either: the
+# tour is rebuilt by re-doing the (cheap) minimisation for only the N states on the final tour.
+
+# VECTORIZATION: The subpath for a 'mask' only depends on subpaths with one less visited node.
+# So all masks with the same number of '1' bits (the same popcount) form a "layer" which can be
+# solved at once from the previous layer:
+#       memo[mask][j] = min over k of (memo[mask without j][k] + m[k][j])
+# For one end node 'j' and a batch of masks, memo[masks without j] is a 2D array (one row per
+# mask) and adding column 'j' of the distance matrix broadcasts across the rows, so the minimum
+# over 'k' is a single min(axis=1) call. States where 'k' is not in the mask hold infinity and
+# never win the minimum. The masks of a layer are processed in batches of 'batch_size' to bound
+# the size of the temporary arrays.
+
+
+class TspDynamicProgrammingSolver:
+    # distance - N x N adjacency matrix, start - index of the start node 'S',
+    # dtype - np.float32 halves the memory of the memo table (exact for integer weights < 2^24)
+    def __init__(self, distance, start=0, dtype=np.float64, batch_size=1 << 16):
+        self.distance = np.asarray(distance, dtype=dtype)
+        self.n = len(self.distance)
+        if self.distance.shape != (self.n, self.n):
+            raise ValueError('Matrix must be square (n x n)')
+        if start < 0 or start >= self.n:
+            raise ValueError('Invalid start node.')
+        if self.n > 31:
+            raise ValueError('Matrix too large! A matrix that size for the DP TSP problem with a '
+                             'time complexity of O(n^2 * 2^n) requires way too much computation for '
+                             'any modern home computer to handle')
+        self.start = start
+        self.dtype = dtype
+        self.batch_size = batch_size
+        # the nodes other than the start node, in bit order
+        self.others = np.array([i for i in range(self.n) if i != start], dtype=np.int64)
+        self.solved = False
+
+    def get_tour(self):
+        if not self.solved:
+            self.solve()
+        return self.tour
+
+    def get_tour_cost(self):
+        if not self.solved:
+            self.solve()
+        return self.min_tour_cost
+
+    def solve(self):
+        if self.solved:
+            return
+        n, start, others = self.n, self.start, self.others
+        m = len(others)
+        if m == 0:
+            self.tour, self.min_tour_cost = [start, start], 0
+            self.solved = True
+            return
+        # distances between the other nodes, and from/to the start node
+        between = self.distance[np.ix_(others, others)]
+        from_start = self.distance[start, others]
+        to_start = self.distance[others, start]
+
+        memo = np.full((1 << m, m), np.inf, dtype=self.dtype)
+        memo[1 << np.arange(m), np.arange(m)] = from_start
+        masks = np.arange(1 << m, dtype=np.int64)
+        popcount = np.zeros(1 << m, dtype=np.uint8)
+        for j in range(m):
+            popcount += ((masks >> j) & 1).astype(np.uint8)
+
+        for r in range(2, m + 1):
+            layer = masks[popcount == r]
+            for j in range(m):
+                with_j = layer[(layer >> j) & 1 == 1]
+                for i in range(0, len(with_j), self.batch_size):
+                    batch = with_j[i:i + self.batch_size]
+                    prev = memo[batch ^ (1 << j)] + between[:, j]
+                    memo[batch, j] = prev.min(axis=1)
+
+        full = (1 << m) - 1
+        costs = memo[full] + to_start
+        last = int(costs.argmin())
+        self.min_tour_cost = costs[last].item()
+        if math.isinf(self.min_tour_cost):
+            # there is no tour through every node (the memo states have no predecessor to follow)
+            self.tour = None
+            self.solved = True
+            return
+
+        # walk backwards from the best end node, re-doing the minimisation for each state
+        tour = [int(others[last])]
+        mask = full
+        while mask != (1 << last):
+            prev_mask = mask ^ (1 << last)
+            last = int((memo[prev_mask] + between[:, last]).argmin())
+            tour.append(int(others[last]))
+            mask = prev_mask
+        tour.append(start)
+        tour.reverse()
+        tour.append(start)
+        self.tour = tour
+        self.solved = True
+
+
+# The 4 node example from above (A = 0, B = 1, C = 2, D = 3)
+tsp_solver = TspDynamicProgrammingSolver([[0, 4, 1, 9], [3, 0, 6, 11], [4, 1, 0, 2], [6, 5, -4, 0]])
+print(tsp_solver.get_tour()) # [0, 3, 2, 1, 0]
+print(tsp_solver.get_tour_cost()) # 9.0
+# no edges back to the start node, so there is no tour
+inf = float('inf')
+tsp_solver = TspDynamicProgrammingSolver([[0, 1, inf], [inf, 0, 1], [inf, inf, 0]])
+print(tsp_solver.get_tour()) # None
+print(tsp_solver.get_tour_cost()) # inf
+
+
+
+
+
+
+# NETWORK FLOW: MAXIMUM FLOW AND MINIMUM CUT
+
+# A flow network is a directed graph where every edge has a capacity, with a source node 's' and
+# a sink node 't'. The maximum flow is the largest amount of flow which can be sent from 's' to
+# 't' without exceeding the capacity of any edge (flow in = flow out for every other node).
+# By the max-flow min-cut theorem, it equals the capacity of a MINIMUM CUT: a partition of the
+# nodes into a source side (with 's') and a sink side (with 't') where the total capacity of the
+# edges going from the source side to the sink side is minimal.
+
+# RESIDUAL GRAPH: Every edge is stored together with a residual edge in the opposite direction
+# with a capacity of 0. Sending 'd' units of flow over an edge lowers its remaining capacity by
+# 'd' and raises the capacity of its residual edge by 'd', so that the flow can be "undone" later.
+# The edges are stored in typed arrays indexed by edge id, where the edge 'e' and its residual
+# edge are the pair (e, e ^ 1): edge 2k and edge 2k + 1. Only the remaining capacity 'res' is
+# stored, the flow over an edge is its original capacity minus 'res'. Before solving, the edge ids
+# are grouped by their tail node into CSR arrays ('offsets' and 'edge_ids', see CSRGraph in
+# 'graphs.py'), so the edges out of node 'u' are edge_ids[offsets[u]:offsets[u + 1]].
+# The capacities are integers (like the long capacities of the Java sources).
+
+# Edmonds-Karp finds one shortest augmenting path with a BFS per augmentation, which takes
+# O(V * E^2) time and is too slow for graphs with millions of edges. The two solvers below are
+# the usual choice for large networks:
+
+# DINIC'S ALGORITHM: A BFS from 's' over the edges with remaining capacity computes the LEVEL of
+# every node (its distance from 's'). The LEVEL GRAPH only keeps the edges going from one level to
+# the next, so every path in it is a shortest augmenting path. A DFS then sends flow along paths
+# of the level graph until 't' can't be reached anymore (a "blocking flow"), and the BFS is
+# repeated. The level of 't' grows every phase, so there are at most V phases.
+# CURRENT-ARC POINTERS: Every node remembers in 'cursor' which of its edges the DFS should try
+# next. An edge which is saturated or leads to a dead end is never tried again in the same phase,
+# which bounds a phase by O(V * E). The DFS is iterative: 'path' holds the edges from 's' to the
+# current node, and after an augmentation it is cut back to the first saturated edge.
+# The total time is O(V^2 * E), and O(E * sqrt(V)) for unit capacity networks such as bipartite
+# matching (assignment) problems.
+
+# HIGHEST-LABEL PUSH-RELABEL: Instead of augmenting paths, 's' first floods all its edges, and
+# nodes are allowed to hold more flow in than out (an EXCESS). Every node has a height (label) and
+# excess can only be PUSHED downhill, over an edge with remaining capacity to a node one level
+# lower. A node with excess which can't push anymore is RELABELED to 1 + the lowest height among
+# its residual neighbours. Always discharging the active node with the HIGHEST label gives an
+# O(V^2 * sqrt(E)) bound, and two heuristics make it fast in practice:
+#   * GLOBAL RELABELING: the heights are set to the exact distances to 't' in the residual graph
+#   with a backwards BFS, at the start and again after every 'n' relabels.
+#   * GAP HEURISTIC: when no node is left at some height 'h', the nodes above 'h' can't reach 't'
+#   anymore, and they are lifted to a height of 'n' at once (they belong to the source side).
+# Only the first phase of push-relabel is run: once no node below height 'n' has excess, the
+# excess at 't' is the maximum flow and the nodes which can still reach 't' in the residual graph
+# are the sink side of a minimum cut. The excess left in the source side is not sent back to 's',
+# so unlike with Dinic's algorithm, the flow over the individual edges is not available.
+
+
+# The subclasses implement solve(), which computes 'max_flow' and 'min_cut' from the residual
+# capacities in 'res' (rebuilt from 'capacity' before every solve).
+class NetworkFlowSolverBase:
+    # n - number of nodes, s - index of the source node, t - index of the sink node
+    def __init__(self, n, s, t):
+        if s == t:
+            raise ValueError('Source and sink must be different nodes')
+        self.n = n
+        self.s = s
+        self.t = t
+        self.head = array('i') # node the edge points to
+        self.capacity = array('q')
+        self.res = None # remaining capacity of the edge, set up when solving
+        self.solved = False
+        self.max_flow = 0
+        self.min_cut = None
+
+    # Adds a directed edge with the given capacity and returns its edge id
+    def add_edge(self, frm, to, capacity):
+        if capacity < 0:
+            raise ValueError('Capacity must be non negative')
+        e = len(self.head)
+        self.head.extend((to, frm))
+        self.capacity.extend((capacity, 0))
+        self.solved = False
+        return e
+
+    def get_max_flow(self):
+        self._execute()
+        return self.max_flow
+
+    # Returns a bytearray where min_cut[i] is 1 if node 'i' is on the source side of the cut
+    def get_min_cut(self):
+        self._execute()
+        return self.min_cut
+
+    def _execute(self):
+        if self.solved:
+            return
+        # start from an empty flow, so edges added after a solve are counted in the whole flow
+        self.res = array('q', self.capacity)
+        self._build()
+        self.solve()
+        self.solved = True
+
+    # groups the edge ids by their tail node (the head of the residual edge) into CSR arrays
+    def _build(self):
+        n, head = self.n, self.head
+        offsets = array('i', [0]) * (n + 1)
+        for e in range(len(head)):
+            offsets[head[e ^ 1] + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        fill = array('i', offsets)
+        edge_ids = array('i', [0]) * len(head)
+        for e in range(len(head)):
+            tail = head[e ^ 1]
+            edge_ids[fill[tail]] = e
+            fill[tail] += 1
+        self.offsets, self.edge_ids = offsets, edge_ids
+
+
+class DinicSolver(NetworkFlowSolverBase):
+    # Returns the flow over the edge 'e' (an id returned by add_edge())
+    def get_flow(self, e):
+        self._execute()
+        return self.capacity[e] - self.res[e]
+
+    def solve(self):
+        self.max_flow = 0
+        while self._bfs():
+            self.max_flow += self._blocking_flow()
+        # the nodes reached by the last BFS are the source side of a minimum cut
+        self.min_cut = bytearray(level != -1 for level in self.level)
+
+    # computes the level of every node reachable from 's', returns whether 't' was reached
+    def _bfs(self):
+        offsets, edge_ids, head, res = self.offsets, self.edge_ids, self.head, self.res
+        level = array('i', [-1]) * self.n
+        level[self.s] = 0
+        queue = [self.s]
+        for at in queue:
+            for i in range(offsets[at], offsets[at + 1]):
+                e = edge_ids[i]
+                to = head[e]
+                if res[e] > 0 and level[to] == -1:
+                    level[to] = level[at] + 1
+                    queue.append(to)
+        self.level = level
+        return level[self.t] != -1
+
+    def _blocking_flow(self):
+        offsets, edge_ids, head, res, level = self.offsets, self.edge_ids, self.head, self.res, self.level
+        s, t = self.s, self.t
+        cursor = array('i', offsets[:-1])
+        path = []
+        total = 0
+        at = s
+        while True:
+            if at == t:
+                bottleneck = min(res[e] for e in path)
+                for e in path:
+                    res[e] -= bottleneck
+                    res[e ^ 1] += bottleneck
+                total += bottleneck
+                # retreat to the tail of the first saturated edge on the path
+                k = 0
+                while res[path[k]] > 0:
+                    k += 1
+                at = head[path[k] ^ 1]
+                del path[k:]
+                continue
+            i, end = cursor[at], offsets[at + 1]
+            while i < end:
+                e = edge_ids[i]
+                if res[e] > 0 and level[head[e]] == level[at] + 1:
+                    break
+                i += 1
+            cursor[at] = i
+            if i < end:
+                path.append(e)
+                at = head[e]
+                continue
+            # dead end: 'at' can't reach 't' anymore in this phase
+            if at == s:
+                return total
+            e = path.pop()
+            at = head[e ^ 1]
+            cursor[at] += 1
+
+
+class PushRelabelSolver(NetworkFlowSolverBase):
+    def solve(self):
+        n, s, t = self.n, self.s, self.t
+        offsets, edge_ids, head, res = self.offsets, self.edge_ids, self.head, self.res
+        excess = array('q', [0]) * n
+        cursor = array('i', offsets[:-1])
+        self.height = height = array('i', [0]) * n
+
+        # flood every edge out of the source
+        for i in range(offsets[s], offsets[s + 1]):
+            e = edge_ids[i]
+            d = res[e]
+            res[e] = 0
+            res[e ^ 1] += d
+            excess[head[e]] += d
+            excess[s] -= d
+
+        count, buckets, max_height = self._global_relabel(excess)
+        relabels = 0
+        while max_height >= 0:
+            bucket = buckets[max_height]
+            if not bucket:
+                max_height -= 1
+                continue
+            at = bucket.pop()
+            # skip nodes whose height changed (by a gap or global relabel) after being added
+            if height[at] != max_height or excess[at] == 0:
+                continue
+            # discharge 'at'
+            while excess[at] > 0:
+                i = cursor[at]
+                if i == offsets[at + 1]:
+                    # relabel 'at' to 1 + the lowest height of its residual neighbours
+                    old_height = height[at]
+                    new_height = n
+                    for j in range(offsets[at], offsets[at + 1]):
+                        e = edge_ids[j]
+                        if res[e] > 0 and height[head[e]] + 1 < new_height:
+                            new_height = height[head[e]] + 1
+                    cursor[at] = offsets[at]
+                    count[old_height] -= 1
+                    if count[old_height] == 0:
+                        # gap: nothing above 'old_height' can reach 't' anymore
+                        for node in range(n):
+                            if old_height < height[node] < n:
+                                count[height[node]] -= 1
+                                height[node] = n
+                        new_height = n
+                    height[at] = new_height
+                    if new_height >= n:
+                        break
+                    count[new_height] += 1
+                    relabels += 1
+                    continue
+                e = edge_ids[i]
+                to = head[e]
+                if res[e] > 0 and height[at] == height[to] + 1:
+                    d = min(excess[at], res[e])
+                    res[e] -= d
+                    res[e ^ 1] += d
+                    excess[at] -= d
+                    if excess[to] == 0 and to != t:
+                        buckets[height[to]].append(to)
+                        # 'at' may have been relabeled above the bucket it came from
+                        if height[to] > max_height:
+                            max_height = height[to]
+                    excess[to] += d
+                else:
+                    cursor[at] = i + 1
+            # 'at' is done: it has no excess left, or it was lifted to the source side (height n)
+            if relabels >= n:
+                count, buckets, max_height = self._global_relabel(excess)
+                # the heights changed, so arcs skipped by the cursors may be admissible again
+                cursor = array('i', offsets[:-1])
+                relabels = 0
+
+        self.max_flow = excess[t]
+        # the nodes which can't reach 't' in the residual graph are the source side
+        self.min_cut = bytearray(h >= n for h in self._distances_to_sink())
+
+    # returns the distance from every node to 't' in the residual graph ('n' if unreachable)
+    def _distances_to_sink(self):
+        n, offsets, edge_ids, head, res = self.n, self.offsets, self.edge_ids, self.head, self.res
+        dist = array('i', [n]) * n
+        dist[self.t] = 0
+        queue = [self.t]
+        for at in queue:
+            for i in range(offsets[at], offsets[at + 1]):
+                e = edge_ids[i]
+                # 'e ^ 1' is an edge from head[e] into 'at'
+                if res[e ^ 1] > 0 and dist[head[e]] == n:
+                    dist[head[e]] = dist[at] + 1
+                    queue.append(head[e])
+        return dist
+
+    # sets every height to the distance to 't' and rebuilds the buckets of active nodes
+    def _global_relabel(self, excess):
+        n, s, t, height = self.n, self.s, self.t, self.height
+        height[:] = self._distances_to_sink()
+        height[s] = n
+        count = array('i', [0]) * (n + 1)
+        buckets = [[] for _ in range(n)]
+        max_height = -1
+        for node in range(n):
+            h = height[node]
+            count[h] += 1
+            if h < n and excess[node] > 0 and node != t and node != s:
+                buckets[h].append(node)
+                max_height = max(max_height, h)
+        return count, buckets, max_height
+
+
+# Example flow network with the source s = 0 and the sink t = 5
+edges = [(0, 1, 10), (0, 2, 10), (1, 2, 2), (1, 3, 4), (1, 4, 8), (2, 4, 9), (4, 3, 6), (3, 5, 10),
+         (4, 5, 10)]
+for solver_class in (DinicSolver, PushRelabelSolver):
+    flow_solver = solver_class(6, 0, 5)
+    for frm, to, capacity in edges:
+        flow_solver.add_edge(frm, to, capacity)
+    print(flow_solver.get_max_flow()) # 19
+    print(list(flow_solver.get_min_cut())) # [1, 0, 1, 0, 0, 0]
+    # edges added after solving are included when the flow is solved again
+    flow_solver.add_edge(0, 5, 3)
+    print(flow_solver.get_max_flow()) # 22
+
+# A random bipartite matching (200 x 200 nodes, 2 edges per left node) where the global relabels
+# must reset the current arcs of push-relabel for it to agree with Dinic's algorithm
+import random
+
+rng = random.Random(17)
+matching_edges = [(u, 200 + rng.randrange(200)) for u in range(200) for _ in range(2)]
+for solver_class in (DinicSolver, PushRelabelSolver):
+    flow_solver = solver_class(402, 400, 401)
+    for u in range(200):
+        flow_solver.add_edge(400, u, 1)
+        flow_solver.add_edge(200 + u, 401, 1)
+    for frm, to in matching_edges:
+        flow_solver.add_edge(frm, to, 1)
+    print(flow_solver.get_max_flow()) # 167
+
+
+
+
+
+
+# EULERIAN PATHS AND CIRCUITS
+
+# An EULERIAN PATH is a path which uses every edge of a graph exactly once. An EULERIAN CIRCUIT is
+# an Eulerian path which starts and ends at the same node. Whether they exist only depends on the
+# degrees of the nodes (plus all the edges being connected):
+#   * Undirected graph: an Eulerian circuit exists if every node has an even degree, and an
+#   Eulerian path if either every node or exactly two nodes have an odd degree (the path then
+#   starts at one of the two and ends at the other).
+#   * Directed graph: an Eulerian circuit exists if every node has as many incoming as outgoing
+#   edges, and an Eulerian path if, in addition, at most one node has one more outgoing than
+#   incoming edge (the start node) and at most one node has one more incoming than outgoing edge
+#   (the end node).
+# This is the same in/out degree bookkeeping as in topsort (Kahn's algorithm counts in-degrees).
+
+# HIERHOLZER'S ALGORITHM finds the path in O(E): follow unused edges from the start node until
+# getting stuck (which can only happen at the end node), then backtrack, and whenever a node with
+# unused edges is backtracked to, walk a detour from it which is spliced into the path. The usual
+# recursive version needs a call stack as deep as the path, ie: as deep as the number of edges.
+# The iterative version keeps the current walk on an explicit 'stack'. A node is moved from the
+# stack to the 'path' once all its edges are used, so the nodes reach 'path' in reverse order.
+# CURSORS: The edges out of every node are stored in CSR form (as in CSRGraph of 'graphs.py'),
+# and cursor[u] is the position of the next unused edge of node 'u', so that every edge is looked
+# at once. In an undirected graph every edge is stored twice (once for each of its nodes), so a
+# 'used' flag per edge id skips the second copy.
+# The degrees are counted and the CSR arrays are built with NumPy, and the walk itself runs over
+# typed arrays (about 4 bytes per edge each), so graphs with hundreds of millions of edges (eg: de
+# Bruijn graphs in sequence assembly) fit in memory.
+
+
+def _typed(values):
+    typed = array('i')
+    typed.frombytes(np.ascontiguousarray(values, dtype=np.int32).tobytes())
+    return typed
+
+
+class EulerianPathSolver:
+    # n - number of nodes, src/dst - the columns of the edge list
+    def __init__(self, n, src, dst, directed=True):
+        self.n = n
+        self.src = np.asarray(src, dtype=np.int64)
+        self.dst = np.asarray(dst, dtype=np.int64)
+        self.directed = directed
+        self.edge_count = len(self.src)
+        if directed:
+            self.out_degree = np.bincount(self.src, minlength=n)
+            self.in_degree = np.bincount(self.dst, minlength=n)
+        else:
+            self.degree = np.bincount(self.src, minlength=n) + np.bincount(self.dst, minlength=n)
+
+    # Builds the solver from (from, to) tuples
+    @classmethod
+    def from_edges(cls, n, edges, directed=True):
+        src, dst = zip(*edges) if edges else ((), ())
+        return cls(n, src, dst, directed)
+
+    # Returns the node an Eulerian path has to start at, or -1 when the degrees rule it out
+    def find_start_node(self):
+        if self.edge_count == 0:
+            return -1
+        if self.directed:
+            diff = self.out_degree - self.in_degree
+            starts = np.flatnonzero(diff == 1)
+            ends = np.flatnonzero(diff == -1)
+            if np.abs(diff).max() > 1 or len(starts) > 1 or len(ends) > 1 or len(starts) != len(ends):
+                return -1
+            if len(starts):
+                return int(starts[0])
+            return int(np.flatnonzero(self.out_degree)[0])
+        odd = np.flatnonzero(self.degree % 2)
+        if len(odd) not in (0, 2):
+            return -1
+        if len(odd):
+            return int(odd[0])
+        return int(np.flatnonzero(self.degree)[0])
+
+    def has_eulerian_path(self):
+        return self.get_eulerian_path() is not None
+
+    def has_eulerian_circuit(self):
+        path = self.get_eulerian_path()
+        return path is not None and path[0] == path[-1]
+
+    # Returns the nodes of an Eulerian path as an array('i') of E + 1 nodes, or None if the graph
+    # has no Eulerian path (or no edges)
+    def get_eulerian_path(self):
+        start = self.find_start_node()
+        if start == -1:
+            return None
+        n, src, dst = self.n, self.src, self.dst
+        edge_ids = np.arange(self.edge_count)
+        if self.directed:
+            tails, heads = src, dst
+        else:
+            # every undirected edge is stored once for each of its nodes
+            tails, heads = np.concatenate((src, dst)), np.concatenate((dst, src))
+            edge_ids = np.concatenate((edge_ids, edge_ids))
+        order = np.argsort(tails, kind='stable')
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tails, minlength=n), out=offsets[1:])
+        cursor, end = _typed(offsets[:-1]), _typed(offsets[1:])
+        heads, edge_ids = _typed(heads[order]), _typed(edge_ids[order])
+
+        used = None if self.directed else bytearray(self.edge_count)
+        stack = array('i', [start])
+        path = array('i')
+        while stack:
+            at = stack[-1]
+            i = cursor[at]
+            if used is not None:
+                # skip the second copies of the undirected edges which were already walked
+                while i < end[at] and used[edge_ids[i]]:
+                    i += 1
+            if i < end[at]:
+                cursor[at] = i + 1
+                if used is not None:
+                    used[edge_ids[i]] = 1
+                stack.append(heads[i])
+            else:
+                cursor[at] = i
+                path.append(stack.pop())
+
+        # some edges were not reached from the start node: the edges are not connected
+        if len(path) != self.edge_count + 1:
+            return None
+        path.reverse()
+        return path
+
+
+# Directed graph with an Eulerian path from node 1 to node 6
+solver = EulerianPathSolver.from_edges(7, [(1, 2), (1, 3), (2, 2), (2, 4), (2, 4), (3, 1), (3, 2), (3, 5),
+                                           (4, 3), (4, 6), (5, 6), (6, 3)])
+print(list(solver.get_eulerian_path())) # [1, 2, 2, 4, 3, 1, 3, 2, 4, 6, 3, 5, 6]
+# Undirected graph: a square with one diagonal has two odd nodes (1 and 3)
+solver = EulerianPathSolver.from_edges(4, [(0, 1), (1, 2), (2, 3), (3, 0), (1, 3)], directed=False)
+print(list(solver.get_eulerian_path()), solver.has_eulerian_circuit()) # [1, 2, 3, 0, 1, 3] False
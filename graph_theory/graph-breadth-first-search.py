@@ -61,6 +61,77 @@ function reconstructPath(s, e, prev):
 """
 
 
+# PYTHON IMPLEMENTATION OF BIDIRECTIONAL BFS
+
+# When only the shortest path between 's' and 'e' is needed, the BFS above explores every node
+# closer to 's' than 'e' is. With an average of 'b' neighbours per node and 'e' at distance 'd',
+# that is about b^d nodes. A bidirectional BFS runs one BFS from 's' over the edges and one from
+# 'e' over the reversed edges (the same edges for an undirected graph), and always expands the
+# side with the smaller frontier by one whole layer. The two searches meet halfway, after about
+# 2 * b^(d/2) nodes, which is orders of magnitude fewer on large sparse graphs.
+# STOPPING CRITERION: The first edge found between the two searches does not have to be on a
+# shortest path, since nodes of the same layer are expanded in an arbitrary order. The layer in
+# which the searches meet is always finished, and the best meeting edge of that layer is kept.
+# Any later layer would only give longer paths.
+
+from array import array
+
+
+# g - adjacency list, rg - adjacency list of the reversed edges (None for an undirected graph)
+# Returns the shortest path from 's' to 'e' inclusive, or an empty list if there is none.
+def bidirectional_bfs(g, s, e, rg=None):
+    n = len(g)
+    if rg is None:
+        rg = g
+    if s == e:
+        return [s]
+    graphs = (g, rg)
+    dist = (array('i', [-1]) * n, array('i', [-1]) * n)
+    prev = (array('i', [-1]) * n, array('i', [-1]) * n)
+    frontiers = ([s], [e])
+    dist[0][s] = dist[1][e] = 0
+    best, meet = -1, None
+
+    while frontiers[0] and frontiers[1] and meet is None:
+        # 0 expands the forward search from 's', 1 the backward search from 'e'
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        this_dist, other_dist, this_prev = dist[side], dist[1 - side], prev[side]
+        next_frontier = []
+        for node in frontiers[side]:
+            for to in graphs[side][node]:
+                if other_dist[to] != -1:
+                    length = this_dist[node] + 1 + other_dist[to]
+                    if meet is None or length < best:
+                        best, meet = length, (node, to) if side == 0 else (to, node)
+                if this_dist[to] == -1:
+                    this_dist[to] = this_dist[node] + 1
+                    this_prev[to] = node
+                    next_frontier.append(to)
+        if side == 0:
+            frontiers = (next_frontier, frontiers[1])
+        else:
+            frontiers = (frontiers[0], next_frontier)
+
+    if meet is None:
+        return []
+    # 'meet' is the edge (a, b) joining the two halves of the path
+    path = []
+    at = meet[0]
+    while at != -1:
+        path.append(at)
+        at = prev[0][at]
+    path.reverse()
+    at = meet[1]
+    while at != -1:
+        path.append(at)
+        at = prev[1][at]
+    return path
+
+
+g = [[1, 2], [3], [3, 4], [5], [5], []]
+print(bidirectional_bfs(g, 0, 5, [[], [0], [0], [1, 2], [2], [3, 4]])) # [0, 1, 3, 5]
+
+
 # BFS Shortest Path on a Grid:
 
 # Many problems in graph theory can be represented using a grid. Grids are a form of "implicit graph"
@@ -225,4 +296,130 @@ function explore_neighbours(r, c):
         cq.enqueue(cc)
         visited[rr][cc] = true
         nodes_in_next_layer++
-"""
\ No newline at end of file
+"""
+
+# PYTHON IMPLEMENTATION OF BFS ON A GRID USING NUMPY
+
+# The pseudocode above dequeues one cell at a time and explores its neighbours in a loop, which
+# is far too slow in Python on large grids (a 4096 x 4096 occupancy map has 16 million cells).
+# Instead, the whole layer of cells at the same distance (the "frontier") is expanded at once:
+#   * The grid is padded with one layer of blocked cells on every side. Every cell is then
+#     represented by its flat index into the padded grid, and the direction vectors turn into
+#     flat index offsets (eg: -C and +C for north/south, -1 and +1 for west/east). Thanks to the
+#     padding, cells on the border never produce out of bounds neighbours, so no bounds checks
+#     are needed. This is the "one queue per dimension" idea taken one step further: one flat
+#     queue for any number of dimensions (2D and 3D grids work the same way).
+#   * The neighbours of the frontier are computed with one broadcasted addition of the offsets,
+#     the visited or blocked ones are dropped with a boolean mask and duplicates are removed.
+#     What is left is the next frontier, and its distance is the layer count.
+#   * A cell can be the neighbour of several frontier cells. Instead of sorting the neighbours
+#     with np.unique() to remove the duplicates, every neighbour writes its position in the
+#     neighbour array into an 'owner' array. When a cell is written more than once, only the
+#     last write survives, so keeping the neighbours which still own their cell keeps exactly
+#     one copy of every cell in O(k) instead of O(k log k).
+# Several start cells can be given at once (multi-source BFS): they all start in the first
+# frontier with distance 0, so every cell gets the distance to its nearest start cell. The search
+# stops early as soon as one of the 'targets' is reached. Instead of a 'prev' matrix, a path is
+# rebuilt by walking back from the target to any neighbour with a distance of one less.
+
+import numpy as np
+
+
+class GridBFS:
+    UNREACHED = -1
+
+    # 'grid' - 2D or 3D array where non zero cells are blocked (eg: rocks in the dungeon)
+    # 'diagonal' - also allow moving diagonally (8 neighbours in 2D, 26 in 3D)
+    def __init__(self, grid, diagonal=False):
+        grid = np.asarray(grid)
+        self.shape = grid.shape
+        self.padded_shape = tuple(s + 2 for s in grid.shape)
+        open_cells = np.zeros(self.padded_shape, dtype=bool)
+        open_cells[tuple(slice(1, -1) for _ in grid.shape)] = grid == 0
+        self.open_cells = open_cells.ravel()
+
+        strides = np.array([int(np.prod(self.padded_shape[i + 1:])) for i in range(grid.ndim)])
+        directions = np.array(np.meshgrid(*[[-1, 0, 1]] * grid.ndim, indexing='ij')).reshape(grid.ndim, -1).T
+        moves = np.abs(directions).sum(axis=1)
+        directions = directions[(moves > 0) & ((moves == 1) | diagonal)]
+        self.offsets = directions @ strides
+        self.dist = None
+
+    # Runs the BFS from the start cell(s) 'sources' (one coordinate tuple or a list of them). If
+    # 'targets' are given, the search stops as soon as one of them is reached. Returns the
+    # distance field: an array shaped like the grid with the number of moves from the nearest
+    # start cell, or UNREACHED (-1) for blocked and unreachable cells (and, when stopping early,
+    # for the cells further away than the target).
+    def solve(self, sources, targets=None):
+        frontier = self._to_flat(sources)
+        if not self.open_cells[frontier].all():
+            raise ValueError('Start cells must not be blocked')
+        dist = np.full(len(self.open_cells), self.UNREACHED, dtype=np.int32)
+        unvisited = self.open_cells.copy()
+        owner = np.zeros(len(self.open_cells), dtype=np.int64)
+        dist[frontier] = 0
+        unvisited[frontier] = False
+        is_target = None
+        if targets is not None:
+            is_target = np.zeros(len(self.open_cells), dtype=bool)
+            is_target[self._to_flat(targets)] = True
+        self.reached = None
+
+        step = 0
+        while len(frontier):
+            if is_target is not None:
+                hits = frontier[is_target[frontier]]
+                if len(hits):
+                    self.reached = self._to_coordinate(hits[0])
+                    break
+            step += 1
+            neighbours = (frontier[:, None] + self.offsets).ravel()
+            neighbours = neighbours[unvisited[neighbours]]
+            position = np.arange(len(neighbours))
+            owner[neighbours] = position
+            frontier = neighbours[owner[neighbours] == position]
+            dist[frontier] = step
+            unvisited[frontier] = False
+
+        self.dist = dist
+        return self._crop(dist)
+
+    # Returns the cells on a shortest path from the nearest start cell to 'target' inclusive, as a
+    # list of coordinate tuples. An empty list is returned if 'target' is unreachable.
+    def shortest_path(self, sources, target):
+        self.solve(sources, [target])
+        dist = self.dist
+        at = int(self._to_flat([target])[0])
+        if dist[at] == self.UNREACHED:
+            return []
+        path = [at]
+        while dist[at] > 0:
+            neighbours = at + self.offsets
+            at = int(neighbours[dist[neighbours] == dist[at] - 1][0])
+            path.append(at)
+        path.reverse()
+        return [self._to_coordinate(cell) for cell in path]
+
+    def _to_flat(self, cells):
+        cells = np.array(cells, dtype=np.int64).reshape(-1, len(self.shape))
+        if ((cells < 0) | (cells >= self.shape)).any():
+            raise IndexError('Cell out of bounds of the grid')
+        return np.ravel_multi_index(tuple((cells + 1).T), self.padded_shape)
+
+    def _to_coordinate(self, cell):
+        return tuple(int(i) - 1 for i in np.unravel_index(cell, self.padded_shape))
+
+    def _crop(self, flat):
+        return flat.reshape(self.padded_shape)[tuple(slice(1, -1) for _ in self.shape)]
+
+
+# The dungeon from above: '#' cells are blocked, 'S' is the start cell and 'E' is the exit
+dungeon = ['S..#...',
+           '.#...#.',
+           '.#.....',
+           '..##...',
+           '#.#E.#.']
+grid = np.array([[cell == '#' for cell in row] for row in dungeon], dtype=np.uint8)
+bfs = GridBFS(grid)
+print(bfs.solve((0, 0))[4, 3]) # 9
+print(bfs.shortest_path((0, 0), (4, 3))) # [(0, 0), (0, 1), (0, 2), (1, 2), (1, 3), (1, 4), (2, 4), (3, 4), (4, 4), (4, 3)]
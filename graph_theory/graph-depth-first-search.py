@@ -68,6 +68,496 @@ function dfs(at):
             dfs(next) # Recursive call
 """
 
+# Connected components and bipartite check without recursion:
+
+# The recursive dfs() above crashes CPython on any component with a path longer than about 1000
+# nodes (the recursion limit). Both functions below keep their own explicit stack (or queue)
+# instead, and write their result into an integer array which the caller can allocate once and
+# reuse (eg: a typed array('i') or a NumPy int32 array), so that a graph with tens of millions
+# of nodes doesn't need millions of Python lists or dictionaries on top of the graph itself.
+# Reading and writing single items is about twice as fast on a typed array as on a NumPy array.
+
+# BIPARTITE CHECK: A graph is bipartite when its nodes can be coloured with two colours so that
+# every edge joins two nodes of different colours. A BFS colours every node with the opposite
+# colour of the node it was discovered from, ie: with the parity of its depth in the BFS tree.
+# If an edge joins two nodes of the same colour, the graph is not bipartite. Since the depths of
+# two neighbours differ by at most one in a BFS, two neighbours with the same colour are at the
+# same depth, so walking up the BFS tree from both nodes at the same pace reaches their common
+# ancestor at the same time. The two tree paths plus the edge are an ODD CYCLE (2 * k + 1 edges),
+# which proves that the graph is not bipartite: a graph is bipartite iff it has no odd cycle.
+
+from array import array
+
+
+# g - adjacency list of an undirected graph, components - array of size n for the results
+# Returns the number of components, and components[i] is the component id of node 'i'.
+def label_components(g, components=None):
+    n = len(g)
+    if components is None:
+        components = array('i', [-1]) * n
+    else:
+        components[:n] = array('i', [-1]) * n
+    count = 0
+    for start in range(n):
+        if components[start] != -1:
+            continue
+        components[start] = count
+        stack = [start]
+        while stack:
+            at = stack.pop()
+            for to in g[at]:
+                if components[to] == -1:
+                    components[to] = count
+                    stack.append(to)
+        count += 1
+    return count, components
+
+
+# g - adjacency list of an undirected graph, colours - array of size n for the results
+# Returns (True, None) and colours[i] is the colour (0 or 1) of node 'i' if the graph is
+# bipartite. Otherwise (False, cycle) is returned, where 'cycle' is an odd cycle [a, b, ..., a].
+def two_colour(g, colours=None):
+    n = len(g)
+    if colours is None:
+        colours = array('i', [-1]) * n
+    else:
+        colours[:n] = array('i', [-1]) * n
+    parent = array('i', [-1]) * n
+    for start in range(n):
+        if colours[start] != -1:
+            continue
+        colours[start] = 0
+        queue = [start]
+        head = 0
+        while head < len(queue):
+            at = queue[head]
+            head += 1
+            for to in g[at]:
+                if colours[to] == -1:
+                    colours[to] = 1 - colours[at]
+                    parent[to] = at
+                    queue.append(to)
+                elif colours[to] == colours[at]:
+                    return False, _odd_cycle(parent, at, to)
+    return True, None
+
+
+def _odd_cycle(parent, u, v):
+    up_u, up_v = [u], [v]
+    while u != v:
+        u, v = parent[u], parent[v]
+        up_u.append(u)
+        up_v.append(v)
+    # up_u and up_v both end at the common ancestor
+    return up_u + up_v[-2::-1] + [up_u[0]]
+
+
+g = [[1, 3], [0, 2], [1, 3], [0, 2], [5], [4]]
+print(label_components(g)[0]) # 2
+print(two_colour(g)) # (True, None)
+g = [[1, 2], [0, 2], [0, 1, 3], [2]]
+print(two_colour(g)) # (False, [1, 0, 2, 1])
+
+
+# Connected components with a Union Find:
+
+# The DFS above has to be run again over the whole graph every time edges are added. When edges
+# arrive in batches (eg: a stream of edges), a Union Find (also called Disjoint Set) keeps the
+# components up to date incrementally: every node points to a parent node of the same component,
+# and the root node (which points to itself) represents the component. Adding an edge is a
+# union() of the components of its two nodes, and two nodes are connected when find() returns
+# the same root for both.
+#   * UNION BY RANK / SIZE: The root of the smaller tree (by 'rank', an upper bound on its height,
+#   or by 'size', its number of nodes) is attached below the root of the larger one, so the trees
+#   stay O(logN) high.
+#   * PATH HALVING: While walking up to the root in find(), every node visited is pointed to its
+#   grandparent. This halves the length of the path for the next find() without the second pass
+#   (or the recursion) of full path compression.
+# Together they make every operation run in amortized O(a(N)), where a(N) is the inverse
+# Ackermann function, which is less than 5 for any practical N: nearly constant time.
+# The parents, ranks and sizes are stored in typed arrays, so a union find over millions of nodes
+# only uses a few bytes per node. find_many() looks up the roots of a whole NumPy array of nodes
+# at once by repeatedly replacing every node with its parent (through a NumPy view of the parent
+# array), until all of them are roots.
+
+import numpy as np
+
+
+class UnionFind:
+    # n - number of nodes, union_by - 'rank' or 'size'
+    def __init__(self, n, union_by='rank'):
+        if n < 0:
+            raise ValueError('Size must be non negative')
+        if union_by not in ('rank', 'size'):
+            raise ValueError('union_by must be \'rank\' or \'size\'')
+        self.n = n
+        self.union_by_rank = union_by == 'rank'
+        self.parent = array('i', range(n))
+        self.size = array('i', [1]) * n
+        self.rank = bytearray(n)
+        self.num_components = n
+
+    def find(self, p):
+        parent = self.parent
+        while parent[p] != p:
+            # path halving: point 'p' to its grandparent and move on to it
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+        return p
+
+    def connected(self, p, q):
+        return self.find(p) == self.find(q)
+
+    # returns the number of nodes in the component of 'p'
+    def component_size(self, p):
+        return self.size[self.find(p)]
+
+    # merges the components of 'p' and 'q', returns False if they were already connected
+    def union(self, p, q):
+        root1, root2 = self.find(p), self.find(q)
+        if root1 == root2:
+            return False
+        self._link(root1, root2)
+        return True
+
+    # merges the components of the nodes of every (p, q) edge, where 'edges' is a NumPy array of
+    # shape (E, 2) or an iterable of pairs. Returns the number of merges done.
+    def union_many(self, edges):
+        if isinstance(edges, np.ndarray):
+            edges = edges.tolist()
+        parent, link = self.parent, self._link
+        merges = 0
+        for p, q in edges:
+            # find() inlined for speed
+            while parent[p] != p:
+                parent[p] = parent[parent[p]]
+                p = parent[p]
+            while parent[q] != q:
+                parent[q] = parent[parent[q]]
+                q = parent[q]
+            if p != q:
+                link(p, q)
+                merges += 1
+        return merges
+
+    # returns a NumPy array of the roots of the given nodes
+    def find_many(self, nodes):
+        parent = np.frombuffer(self.parent, dtype=np.int32)
+        nodes = np.asarray(nodes, dtype=np.int64)
+        roots = parent[nodes]
+        while True:
+            grandparents = parent[roots]
+            if (grandparents == roots).all():
+                break
+            roots = grandparents
+        # point every looked up node straight to its root
+        parent[nodes] = roots
+        return roots
+
+    # Labels the components with the ids [0, num_components): returns a NumPy array with the
+    # component id of every node
+    def labels(self):
+        roots = self.find_many(np.arange(self.n))
+        _, labels = np.unique(roots, return_inverse=True)
+        return labels
+
+    def _link(self, root1, root2):
+        if self.union_by_rank:
+            rank = self.rank
+            if rank[root1] < rank[root2]:
+                root1, root2 = root2, root1
+            elif rank[root1] == rank[root2]:
+                rank[root1] += 1
+        elif self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+        # attach the smaller tree 'root2' below 'root1'
+        self.parent[root2] = root1
+        self.size[root1] += self.size[root2]
+        self.num_components -= 1
+
+
+# Returns the number of connected components and the component id of every node, for a graph
+# with 'n' nodes and the undirected edges in 'edges'
+def find_components(n, edges):
+    uf = UnionFind(n)
+    uf.union_many(edges)
+    return uf.num_components, uf.labels()
+
+
+count, components = find_components(6, np.array([[0, 1], [1, 2], [3, 4]]))
+print(count) # 3
+print(components) # [0 0 0 1 1 2]
+
+
+# Minimum Spanning Trees with a Union Find:
+
+# A Minimum Spanning Tree (MST) of a weighted undirected graph connects all its nodes without
+# cycles using the edges with the minimum total weight (a minimum spanning FOREST, with one
+# tree per component, when the graph is not connected). Eager Prim's algorithm, which grows one
+# tree with an indexed priority queue, is in 'indexed-priority-queue.py'. The two algorithms
+# below work on an edge list instead (the columns 'src', 'dst' and 'weight' as NumPy arrays),
+# and use the Union Find above to tell whether an edge would close a cycle.
+
+# KRUSKAL: Go through the edges from the cheapest to the most expensive and keep every edge
+# which joins two different components (ie: doesn't close a cycle). The edges are sorted with
+# one np.argsort() call and the loop stops as soon as n - 1 edges were kept.
+
+# BORUVKA: In every round, every component picks its cheapest edge to another component, and all
+# the picked edges are added at once. Every round at least halves the number of components, so
+# there are at most O(logV) rounds. Since all the components pick their edges independently,
+# a round is a few NumPy operations over all the remaining edges (instead of a loop over the
+# edges in Python), which scales to edge lists with tens of millions of edges:
+#   * every edge gets the components of its two nodes, and edges inside one component are
+#   dropped for good
+#   * the cheapest edge of every component is found with np.minimum.at() on the position of the
+#   edges in the sorted order (so that equal weights are broken consistently, which prevents
+#   two components from picking two different edges between them and closing a cycle)
+#   * only the picked edges (at most one per component) are merged with a Union Find, and every
+#   node is relabelled with the new component id using find_many()
+
+
+# Returns the edge list (labels, src, dst, weight) of the 'adj_list' dictionary of the Graph
+# classes in 'graphs.py', with every undirected edge once. The weights of a HashedGraph are
+# kept, and every edge of a Graph gets a weight of 1.
+def edge_list(adj_list):
+    labels = list(adj_list)
+    index = {vertex: i for i, vertex in enumerate(labels)}
+    src, dst, weight = [], [], []
+    for vertex, neighbours in adj_list.items():
+        for neighbour in neighbours:
+            if index[vertex] < index[neighbour]:
+                src.append(index[vertex])
+                dst.append(index[neighbour])
+                weight.append(neighbours[neighbour] if isinstance(neighbours, dict) else 1)
+    return labels, np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64), np.array(weight)
+
+
+# Returns the total weight and the indexes of the edges in the MST of the graph with 'n' nodes
+def kruskal_mst(n, src, dst, weight):
+    order = np.argsort(weight, kind='stable')
+    uf = UnionFind(n)
+    union = uf.union
+    chosen = []
+    for e, p, q in zip(order.tolist(), src[order].tolist(), dst[order].tolist()):
+        if union(p, q):
+            chosen.append(e)
+            if len(chosen) == n - 1:
+                break
+    chosen = np.array(chosen, dtype=np.int64)
+    return weight[chosen].sum().item(), chosen
+
+
+# Returns the total weight and the indexes of the edges in the MST of the graph with 'n' nodes
+def boruvka_mst(n, src, dst, weight):
+    order = np.argsort(weight, kind='stable')
+    # the remaining edges, in sorted order: edge order[r] has the endpoints u[r] and v[r]
+    r = np.arange(len(order))
+    u, v = src[order], dst[order]
+    component = np.arange(n)
+    uf = UnionFind(n)
+    chosen = []
+    while True:
+        cu, cv = component[u], component[v]
+        outside = cu != cv
+        r, u, v, cu, cv = r[outside], u[outside], v[outside], cu[outside], cv[outside]
+        if len(r) == 0:
+            break
+        cheapest = np.full(n, len(order), dtype=np.int64)
+        np.minimum.at(cheapest, cu, r)
+        np.minimum.at(cheapest, cv, r)
+        picked = np.unique(cheapest[cheapest < len(order)])
+        chosen.append(order[picked])
+        uf.union_many(np.column_stack((component[src[order[picked]]], component[dst[order[picked]]])))
+        component = uf.find_many(component)
+    chosen = np.concatenate(chosen) if chosen else np.array([], dtype=np.int64)
+    return weight[chosen].sum().item(), chosen
+
+
+# The graph from the eager Prim's example in 'indexed-priority-queue.py'
+src = np.array([0, 0, 1, 1, 2, 3, 2])
+dst = np.array([1, 2, 2, 3, 3, 4, 4])
+weight = np.array([4, 1, 2, 5, 8, 3, 9])
+print(kruskal_mst(5, src, dst, weight)) # (11, array([1, 2, 5, 3]))
+print(boruvka_mst(5, src, dst, weight)[0]) # 11
+
+
+# Finding cycles:
+
+# DIRECTED GRAPHS: An iterative DFS colours every node WHITE (unvisited), GREY (its dfs() call is
+# in progress, ie: it is on the call stack) or BLACK (done). An edge to a GREY node points back
+# into the call stack, and the call stack from that node onwards plus the edge is a cycle.
+# UNDIRECTED GRAPHS: Every edge would look like a cycle of length 2 to the DFS above (a -> b -> a),
+# so the Union Find is used instead: an edge whose two nodes are already connected closes a
+# cycle. The cycle is that edge plus the path between its nodes through the edges seen so far
+# (which form a forest), found with a BFS.
+
+# INCREMENTAL MODE: To reject an edge which would create a cycle before adding it (eg: a new
+# dependency between two tasks), searching the whole graph for every new edge costs O(V + E) per
+# edge. For undirected graphs, the Union Find answers in O(a(N)). For directed graphs, the
+# detector keeps a topological ordering 'order' of the nodes up to date (Pearce and Kelly's
+# dynamic topological sort):
+#   * An edge u -> v with order[u] < order[v] agrees with the ordering: it can't close a cycle
+#   and is added in O(1). Most edges of a dependency graph which is built in order are like this.
+#   * Otherwise, a cycle exists iff 'u' is reachable from 'v'. Any such path only goes through
+#   nodes between order[v] and order[u], so a DFS forward from 'v' and a DFS backward from 'u'
+#   only explore that "affected region" instead of the whole graph. If the forward DFS reaches
+#   'u', the edge is rejected and the cycle is returned. Otherwise the nodes which reach 'u'
+#   are moved before the nodes reachable from 'v', reusing the same positions of the ordering.
+
+
+# g - adjacency list of a directed graph
+# Returns a cycle [a, b, ..., a] of the graph, or None if the graph has no cycles
+def find_directed_cycle(g):
+    WHITE, GREY, BLACK = 0, 1, 2
+    n = len(g)
+    colour = bytearray(n)
+    edge_index = array('i', [0]) * n
+    for start in range(n):
+        if colour[start] != WHITE:
+            continue
+        colour[start] = GREY
+        call_stack = [start]
+        while call_stack:
+            at = call_stack[-1]
+            i = edge_index[at]
+            if i < len(g[at]):
+                edge_index[at] = i + 1
+                to = g[at][i]
+                if colour[to] == WHITE:
+                    colour[to] = GREY
+                    call_stack.append(to)
+                elif colour[to] == GREY:
+                    return call_stack[call_stack.index(to):] + [to]
+                continue
+            colour[at] = BLACK
+            call_stack.pop()
+    return None
+
+
+# n - number of nodes, edges - the (p, q) edges of an undirected graph
+# Returns a cycle [a, b, ..., a] of the graph, or None if the graph has no cycles
+def find_undirected_cycle(n, edges):
+    uf = UnionFind(n)
+    forest = [[] for _ in range(n)]
+    for p, q in edges:
+        if uf.union(p, q):
+            forest[p].append(q)
+            forest[q].append(p)
+        else:
+            return _forest_path(forest, q, p) + [q]
+    return None
+
+
+# Returns the path from 'start' to 'end' in a forest, where both nodes are in the same tree
+def _forest_path(forest, start, end):
+    prev = {start: None}
+    queue = [start]
+    for at in queue:
+        if at == end:
+            break
+        for to in forest[at]:
+            if to not in prev:
+                prev[to] = at
+                queue.append(to)
+    path = []
+    while end is not None:
+        path.append(end)
+        end = prev[end]
+    path.reverse()
+    return path
+
+
+class IncrementalCycleDetector:
+    # n - number of nodes, directed - whether the edges are directed
+    def __init__(self, n, directed=True):
+        self.n = n
+        self.directed = directed
+        self.graph = [[] for _ in range(n)]
+        if directed:
+            self.reverse_graph = [[] for _ in range(n)]
+            # order[node] is the position of 'node' in the topological ordering
+            self.order = array('i', range(n))
+        else:
+            self.uf = UnionFind(n)
+
+    # Adds the edge u -> v unless it would create a cycle. Returns None when the edge was
+    # added, otherwise the edge is rejected and the cycle [u, v, ..., u] it would create is
+    # returned.
+    def add_edge(self, u, v):
+        if not self.directed:
+            if not self.uf.union(u, v):
+                return [u] + _forest_path(self.graph, v, u)
+            self.graph[u].append(v)
+            self.graph[v].append(u)
+            return None
+        if u == v:
+            return [u, u]
+        order = self.order
+        if order[u] > order[v]:
+            cycle = self._reorder(u, v)
+            if cycle is not None:
+                return cycle
+        self.graph[u].append(v)
+        self.reverse_graph[v].append(u)
+        return None
+
+    # Returns whether adding the edge u -> v would create a cycle, without adding it
+    def would_create_cycle(self, u, v):
+        if not self.directed:
+            return self.uf.connected(u, v)
+        if u == v:
+            return True
+        if self.order[u] < self.order[v]:
+            return False
+        return self._search(v, self.order[u], self.graph, u)[1] is not None
+
+    # DFS from 'start' over the nodes whose position in the ordering is at most 'bound' (or at
+    # least 'bound' when going 'backward'). Returns the visited nodes, and the path to 'target'
+    # if it was reached.
+    def _search(self, start, bound, graph, target=None, backward=False):
+        order = self.order
+        prev = {start: None}
+        stack = [start]
+        while stack:
+            at = stack.pop()
+            for to in graph[at]:
+                if to in prev or (order[to] < bound if backward else order[to] > bound):
+                    continue
+                prev[to] = at
+                if to == target:
+                    path = []
+                    while to is not None:
+                        path.append(to)
+                        to = prev[to]
+                    path.reverse()
+                    return prev, path
+                stack.append(to)
+        return prev, None
+
+    def _reorder(self, u, v):
+        order = self.order
+        lower, upper = order[v], order[u]
+        forward, path = self._search(v, upper, self.graph, u)
+        if path is not None:
+            return [u] + path
+        backward, _ = self._search(u, lower, self.reverse_graph, backward=True)
+        # the nodes reaching 'u' go first, then the nodes reachable from 'v', each group keeping
+        # its relative order, over the positions which these nodes already used
+        nodes = sorted(backward, key=order.__getitem__) + sorted(forward, key=order.__getitem__)
+        positions = sorted(order[node] for node in nodes)
+        for node, position in zip(nodes, positions):
+            order[node] = position
+        return None
+
+
+print(find_directed_cycle([[1], [2], [3], [1]])) # [1, 2, 3, 1]
+print(find_undirected_cycle(4, [(0, 1), (1, 2), (2, 3), (3, 1)])) # [1, 2, 3, 1]
+detector = IncrementalCycleDetector(4)
+print(detector.add_edge(2, 3), detector.add_edge(1, 2), detector.add_edge(3, 0)) # None None None
+print(detector.would_create_cycle(0, 1)) # True
+print(detector.add_edge(0, 1)) # [0, 1, 2, 3, 0]
+
+
 # We can also augment the DFS algorithm to:
 
 #   * Compute a Graph's minimum spanning tree (MST).
@@ -675,4 +675,332 @@ public class MinIndexedBinaryHeap <T extends Comparable<T>> extends MinIndexedDH
     super(2, maxSize);
   }
 }
-"""
\ No newline at end of file
+"""
+
+
+# PYTHON IMPLEMENTATION OF A MIN INDEXED D-ARY HEAP
+
+# The 'pm' and 'im' arrays only ever hold integers in the range [-1, N), so we store them in
+# typed arrays from the 'array' module instead of Python lists. A typed array keeps the raw
+# machine integers packed next to each other in memory (4 bytes per entry for the 'i' typecode)
+# rather than an array of pointers to separate int objects. The 'vals' array is kept as a list
+# since the values can be any comparable data type.
+# Like the Java source above, the binary heap is just a D-ary heap with a degree of 2. Unlike
+# the Java source, the parent/child indexes are computed on the fly instead of being stored in
+# 'parent' and 'child' lookup arrays, which saves two integer arrays of size N.
+
+from array import array
+
+
+# Picks the heap degree that balances poll() against decrease_key() for a graph with
+# 'num_edges' edges and 'num_vertices' vertices: D = E/V (the average out-degree), but
+# never less than 2.
+def optimal_degree(num_edges, num_vertices):
+    if num_vertices <= 0:
+        return 2
+    return max(2, num_edges // num_vertices)
+
+
+class MinIndexedDHeap:
+    def __init__(self, degree, max_size):
+        if max_size <= 0:
+            raise ValueError('max_size <= 0')
+        self.d = max(2, degree) # the degree of every node in the heap
+        # the minimal heap will have at least D+1 nodes
+        self.n = max(self.d + 1, max_size) # maximum number of elements in the heap
+        self.sz = 0 # current number of elements in the heap
+        # 'pm' maps a key index (ki) to the position of its node in the heap and 'im' maps a
+        # position in the heap back to the key index stored there: pm[im[i]] = im[pm[i]] = i
+        self.pm = array('i', [-1]) * self.n
+        self.im = array('i', [-1]) * self.n
+        # values associated with the keys, indexed by the key index (ki)
+        self.vals = [None] * self.n
+
+    # Builds a heap whose degree is picked from the edge/vertex ratio of the graph it will be
+    # used on (see optimal_degree() above). The heap holds at most one entry per vertex.
+    @classmethod
+    def for_graph(cls, num_vertices, num_edges):
+        return cls(optimal_degree(num_edges, num_vertices), num_vertices)
+
+    def size(self):
+        return self.sz
+
+    def is_empty(self):
+        return self.sz == 0
+
+    def contains(self, ki):
+        self._key_in_bounds_or_throw(ki)
+        # 'pm[ki]' is -1 when the key at 'ki' is not present in the heap
+        return self.pm[ki] != -1
+
+    def peek_min_key_index(self):
+        self._is_not_empty_or_throw()
+        return self.im[0] # key index of the root node of the min heap
+
+    def poll_min_key_index(self):
+        min_ki = self.peek_min_key_index()
+        self.delete(min_ki)
+        return min_ki
+
+    def peek_min_value(self):
+        self._is_not_empty_or_throw()
+        return self.vals[self.im[0]]
+
+    def poll_min_value(self):
+        min_value = self.peek_min_value()
+        self.delete(self.peek_min_key_index())
+        return min_value
+
+    def poll_min(self):
+        # poll the (key index, value) pair of the root node in one go, so that
+        # callers like Dijkstra's algorithm don't have to peek and poll separately
+        ki = self.peek_min_key_index()
+        return ki, self.delete(ki)
+
+    def insert(self, ki, value):
+        if self.contains(ki):
+            raise ValueError('index already exists; received: ' + str(ki))
+        self._value_not_none_or_throw(value)
+        # place the new key at the bottom-rightmost position of the heap and bubble it up
+        self.pm[ki] = self.sz
+        self.im[self.sz] = ki
+        self.vals[ki] = value
+        self._swim(self.sz)
+        self.sz += 1
+
+    def value_of(self, ki):
+        self._key_exists_or_throw(ki)
+        return self.vals[ki]
+
+    def delete(self, ki):
+        self._key_exists_or_throw(ki)
+        i = self.pm[ki]
+        self.sz -= 1
+        # swap the node to be deleted with the bottom-rightmost node and restore the heap
+        # invariant for the swapped node, which may have to move either up or down the heap
+        self._swap(i, self.sz)
+        self._sink(i)
+        self._swim(i)
+        value = self.vals[ki]
+        self.vals[ki] = None
+        self.pm[ki] = -1
+        self.im[self.sz] = -1
+        return value
+
+    def update(self, ki, value):
+        self._key_exists_or_throw(ki)
+        self._value_not_none_or_throw(value)
+        i = self.pm[ki]
+        old_value = self.vals[ki]
+        self.vals[ki] = value
+        self._sink(i)
+        self._swim(i)
+        return old_value
+
+    # Strictly decreases the value associated with 'ki' to 'value'. Returns True when
+    # the value was updated.
+    def decrease_key(self, ki, value):
+        self._key_exists_or_throw(ki)
+        self._value_not_none_or_throw(value)
+        if value < self.vals[ki]:
+            self.vals[ki] = value
+            self._swim(self.pm[ki])
+            return True
+        return False
+
+    # Strictly increases the value associated with 'ki' to 'value'. Returns True when
+    # the value was updated.
+    def increase_key(self, ki, value):
+        self._key_exists_or_throw(ki)
+        self._value_not_none_or_throw(value)
+        if self.vals[ki] < value:
+            self.vals[ki] = value
+            self._sink(self.pm[ki])
+            return True
+        return False
+
+    # Helper Functions
+
+    # swap the node at 'i' with its minimum child until the heap invariant is satisfied
+    def _sink(self, i):
+        j = self._min_child(i)
+        while j != -1:
+            self._swap(i, j)
+            i = j
+            j = self._min_child(i)
+
+    # swap the node at 'i' with its parent until it is no longer smaller than its parent
+    def _swim(self, i):
+        d = self.d
+        p = (i - 1) // d
+        while i > 0 and self._less(i, p):
+            self._swap(i, p)
+            i = p
+            p = (i - 1) // d
+
+    # From the parent node at index i find the minimum child below it, or -1 if none of the
+    # children are smaller than the parent. min(sz, start + D) is used because the parent may
+    # have less than 'D' children if it is the right-most node in the heap.
+    def _min_child(self, i):
+        index = -1
+        start = i * self.d + 1
+        for j in range(start, min(self.sz, start + self.d)):
+            if self._less(j, i):
+                index = i = j
+        return index
+
+    def _swap(self, i, j):
+        pm, im = self.pm, self.im
+        pm[im[j]] = i
+        pm[im[i]] = j
+        im[i], im[j] = im[j], im[i]
+
+    # Tests if the value of node i < node j
+    def _less(self, i, j):
+        return self.vals[self.im[i]] < self.vals[self.im[j]]
+
+    def _is_not_empty_or_throw(self):
+        if self.is_empty():
+            raise IndexError('Priority queue underflow')
+
+    def _key_exists_or_throw(self, ki):
+        if not self.contains(ki):
+            raise KeyError('Index does not exist; received: ' + str(ki))
+
+    def _value_not_none_or_throw(self, value):
+        if value is None:
+            raise ValueError('value cannot be None')
+
+    def _key_in_bounds_or_throw(self, ki):
+        if ki < 0 or ki >= self.n:
+            raise IndexError('Key index out of bounds; received: ' + str(ki))
+
+    # Checks if this heap is a min heap. Used for testing purposes to validate the heap invariant.
+    def is_min_heap(self):
+        for i in range(1, self.sz):
+            if self._less(i, (i - 1) // self.d):
+                return False
+        return True
+
+
+
+class MinIndexedBinaryHeap(MinIndexedDHeap):
+    def __init__(self, max_size):
+        super().__init__(2, max_size)
+
+
+# Using the people from the example above, keyed by their 'ki' values
+names = ['Anna', 'Bella', 'Carly', 'Dylan', 'Emily', 'Fred', 'George', 'Henry', 'Isaac',
+         'James', 'Kelly', 'Laura']
+values = [3, 15, 11, 17, 7, 9, 2, 1, 6, 5, 16, 4]
+ipq = MinIndexedBinaryHeap(len(names))
+for ki in range(len(names)):
+    ipq.insert(ki, values[ki])
+
+print(names[ipq.peek_min_key_index()], ipq.peek_min_value()) # Henry 1
+ipq.decrease_key(2, 1) # update "Carly" to have a new value of 1
+ipq.delete(7) # remove "Henry"
+print(names[ipq.peek_min_key_index()], ipq.peek_min_value()) # Carly 1
+print(ipq.is_min_heap()) # True
+print([names[ipq.poll_min_key_index()] for _ in range(ipq.size())])
+# ['Carly', 'George', 'Anna', 'Laura', 'James', 'Isaac', 'Emily', 'Fred', 'Bella', 'Kelly', 'Dylan']
+
+# The same queries on a 4-ary heap. The order in which the keys are polled does not depend on
+# the degree of the heap.
+dheap = MinIndexedDHeap(4, len(names))
+for ki in range(len(names)):
+    dheap.insert(ki, values[ki])
+dheap.decrease_key(2, 1)
+dheap.delete(7)
+print(dheap.is_min_heap()) # True
+print([names[dheap.poll_min_key_index()] for _ in range(dheap.size())])
+# ['Carly', 'George', 'Anna', 'Laura', 'James', 'Isaac', 'Emily', 'Fred', 'Bella', 'Kelly', 'Dylan']
+
+# A graph with 1000 nodes and 16000 edges gets a 16-ary heap
+print(MinIndexedDHeap.for_graph(1000, 16000).d) # 16
+
+
+# APPLICATION: EAGER PRIM'S MINIMUM SPANNING TREE (MST) ALGORITHM
+
+# A Minimum Spanning Tree of a weighted undirected graph is a subset of its edges which connects
+# all the nodes together without cycles and with the minimum possible total edge weight.
+# Prim's algorithm grows the MST from a start node, one node at a time: the next node added is
+# always the one with the cheapest edge to a node which is already in the tree. The lazy version
+# pushes every edge it sees onto a priority queue. The eager version keeps at most one entry per
+# node in an IPQ instead: the cheapest known edge into that node. When a cheaper edge to a node
+# which is already in the IPQ is found, its value is lowered with decrease_key(), which is exactly
+# the access pattern the D-ary heap is good at (see optimal_degree()). 'edge_from' remembers the
+# other end of the cheapest edge into every node.
+# When the graph is not connected, the search is restarted from a node which is not in the tree
+# yet, so the result is a minimum spanning FOREST with one tree per connected component.
+
+
+class EagerPrimsSolver:
+    # 'graph' - adjacency list of the undirected graph, either a list where graph[i] holds the
+    # (to, weight) pairs of node 'i', or an 'adj_list' dictionary of the Graph classes in
+    # 'graphs.py' (vertex -> {neighbour: weight} for HashedGraph, vertex -> [neighbours] with a
+    # weight of 1 for Graph)
+    def __init__(self, graph):
+        if isinstance(graph, dict):
+            self.labels = list(graph)
+            index = {vertex: i for i, vertex in enumerate(self.labels)}
+            self.graph = [[(index[to], weights[to] if isinstance(weights, dict) else 1)
+                           for to in weights] for weights in graph.values()]
+        else:
+            self.labels = None
+            self.graph = graph
+        self.n = len(self.graph)
+        self.solved = False
+        self.mst_cost = 0
+        self.mst_edges = []
+
+    # Returns the edges of the minimum spanning tree (or forest) as (from, to, weight) tuples
+    def get_mst(self):
+        self.solve()
+        if self.labels is None:
+            return self.mst_edges
+        return [(self.labels[u], self.labels[v], w) for u, v, w in self.mst_edges]
+
+    def get_mst_cost(self):
+        self.solve()
+        return self.mst_cost
+
+    def solve(self):
+        if self.solved:
+            return
+        n, graph = self.n, self.graph
+        num_edges = sum(len(edges) for edges in graph)
+        ipq = MinIndexedDHeap.for_graph(max(n, 1), num_edges)
+        visited = bytearray(n)
+        edge_from = array('i', [-1]) * n
+        for start in range(n):
+            if visited[start]:
+                continue
+            ipq.insert(start, 0)
+            while not ipq.is_empty():
+                node, weight = ipq.poll_min()
+                visited[node] = 1
+                if edge_from[node] != -1:
+                    self.mst_edges.append((edge_from[node], node, weight))
+                    self.mst_cost += weight
+                for to, w in graph[node]:
+                    if visited[to]:
+                        continue
+                    if not ipq.contains(to):
+                        ipq.insert(to, w)
+                        edge_from[to] = node
+                    elif ipq.decrease_key(to, w):
+                        edge_from[to] = node
+        self.solved = True
+
+
+# Example undirected graph with 5 nodes
+graph = [[] for _ in range(5)]
+for u, v, w in [(0, 1, 4), (0, 2, 1), (1, 2, 2), (1, 3, 5), (2, 3, 8), (3, 4, 3), (2, 4, 9)]:
+    graph[u].append((v, w))
+    graph[v].append((u, w))
+prims = EagerPrimsSolver(graph)
+print(prims.get_mst_cost()) # 11
+print(prims.get_mst()) # [(0, 2, 1), (2, 1, 2), (1, 3, 5), (3, 4, 3)]
+print(EagerPrimsSolver({'A': {'B': 2, 'C': 3}, 'B': {'A': 2, 'C': 1}, 'C': {'A': 3, 'B': 1}}).get_mst())
+# [('A', 'B', 2), ('B', 'C', 1)]
@@ -314,3 +314,467 @@ class TreeNode:
     # list of pointers to child TreeNodes
     TreeNode[] children;
 """
+
+
+# PYTHON IMPLEMENTATION OF THE AHU ALGORITHM WITH INTEGER LABELS
+
+# Building the encoding strings as above costs a lot on deep trees: the label of a node is
+# as long as its whole subtree, and it is copied again by every ancestor while concatenating,
+# which adds up to O(n^2) characters (and as much memory) for a path-like tree, on top of
+# comparing long strings while sorting.
+# The original AHU algorithm avoids this by replacing every label with a small integer: two
+# subtrees are isomorphic iff they have the same (sorted) list of child labels. So the sorted
+# tuple of the child labels of a node is looked up in a table of canonical ids, and a tuple seen
+# for the first time gets the next free id. The label of a node then only costs its number of
+# children to build, and the whole tree is encoded in O(n log n).
+# The nodes are labelled in reverse BFS order (deepest level first), so the children of a node
+# always get their ids before it, without any recursion.
+# The same canonical id always means the same rooted tree, as long as the ids come from the same
+# table. So a single TreeCanonizer shared by many trees assigns canonical ids which can be
+# compared across all of them, and trees can be bucketed into isomorphism classes with a
+# dictionary instead of comparing every pair of trees.
+# An unrooted tree is rooted at its center(s), like in treesAreIsomorphic() above. A tree with
+# two centers gets the sorted pair of the ids of both rootings as its key, so that two isomorphic
+# trees get the same key no matter which of their two centers comes first.
+
+from array import array
+
+
+# g - tree stored as an undirected adjacency list. Returns the center(s) of the tree.
+def tree_centers(g):
+    n = len(g)
+    degree = array('i', [0]) * n
+    leaves = []
+    for i in range(n):
+        degree[i] = len(g[i])
+        if degree[i] <= 1:
+            leaves.append(i)
+            degree[i] = 0
+    count = len(leaves)
+    while count < n:
+        # a cycle has no leaves, so it can't be peeled
+        if not leaves:
+            raise ValueError('Graph is not a tree')
+        new_leaves = []
+        for node in leaves:
+            for neighbour in g[node]:
+                degree[neighbour] -= 1
+                if degree[neighbour] == 1:
+                    new_leaves.append(neighbour)
+            degree[node] = 0
+        count += len(new_leaves)
+        leaves = new_leaves
+    return leaves
+
+
+# Roots the tree 'g' at 'root_id' without recursion. Returns the parent of every node (-1 for
+# the root) and the nodes in BFS order, so that every node comes after its parent.
+def root_tree(g, root_id):
+    parent = array('i', [-1]) * len(g)
+    order = [root_id]
+    for node in order:
+        for child in g[node]:
+            if child != parent[node]:
+                # a node found twice was reached through a cycle
+                if parent[child] != -1 or child == root_id:
+                    raise ValueError('Graph is not a tree')
+                parent[child] = node
+                order.append(child)
+    if len(order) != len(g):
+        raise ValueError('Graph is not a tree')
+    return parent, order
+
+
+class TreeCanonizer:
+    def __init__(self):
+        # sorted tuple of child ids -> canonical id of the rooted tree
+        self.table = {}
+
+    # Returns the canonical id of the tree 'g' rooted at 'root_id'
+    def rooted_id(self, g, root_id):
+        parent, order = root_tree(g, root_id)
+        table = self.table
+        label = array('i', [0]) * len(g)
+        for node in reversed(order):
+            p = parent[node]
+            key = tuple(sorted([label[child] for child in g[node] if child != p]))
+            label[node] = table.setdefault(key, len(table))
+        return label[root_id]
+
+    # Returns the canonical key of the unrooted tree 'g': two trees are isomorphic iff their
+    # keys are equal
+    def unrooted_key(self, g):
+        if not g:
+            return ()
+        return tuple(sorted(self.rooted_id(g, center) for center in tree_centers(g)))
+
+    def trees_are_isomorphic(self, tree1, tree2):
+        return len(tree1) == len(tree2) and self.unrooted_key(tree1) == self.unrooted_key(tree2)
+
+    # Buckets the unrooted 'trees' into isomorphism classes. Returns a list of classes, each one
+    # being the list of the indexes of its trees in 'trees'.
+    def group_isomorphic(self, trees):
+        classes = {}
+        for i, g in enumerate(trees):
+            classes.setdefault(self.unrooted_key(g), []).append(i)
+        return list(classes.values())
+
+
+# The isomorphic trees from above. TREE 2 is built from TREE 1 with the label mapping shown, which
+# hangs node 0 off node 3 (the drawing of TREE 2 attaches it to node 2 instead).
+def adjacency_list(n, edges):
+    g = [[] for _ in range(n)]
+    for u, v in edges:
+        g[u].append(v)
+        g[v].append(u)
+    return g
+
+
+tree1 = adjacency_list(7, [(0, 1), (0, 2), (2, 6), (2, 3), (2, 5), (3, 4)])
+tree2 = adjacency_list(7, [(5, 6), (5, 3), (3, 0), (3, 2), (3, 4), (2, 1)])
+path = adjacency_list(7, [(i, i + 1) for i in range(6)])
+canonizer = TreeCanonizer()
+print(canonizer.trees_are_isomorphic(tree1, tree2)) # True
+print(canonizer.group_isomorphic([tree1, path, tree2])) # [[0, 2], [1]]
+try:
+    tree_centers(adjacency_list(4, [(0, 1), (1, 2), (2, 0), (2, 3)]))
+except ValueError as error:
+    print(error) # Graph is not a tree
+try:
+    canonizer.rooted_id(adjacency_list(3, [(0, 1), (1, 2), (2, 0)]), 0)
+except ValueError as error:
+    print(error) # Graph is not a tree
+
+
+# PYTHON IMPLEMENTATION OF A COMPACT ROOTED TREE
+
+# The TreeNode objects above cost a Python object, a children list and a few pointers per node
+# (around 200 bytes), which doesn't scale to trees with tens of millions of nodes. RootedTree
+# stores the same information, and more, in flat NumPy int32 arrays indexed by node id (a few
+# dozen bytes per node in total):
+#   * parent[v] - parent of 'v' (-1 for the root), depth[v] - number of edges from the root
+#   * children of 'v' in CSR form: children[child_offsets[v]:child_offsets[v + 1]]
+#   * size[v] - number of nodes in the subtree of 'v'
+#   * pre[v] / post[v] - position of 'v' in a preorder / postorder traversal, and 'preorder' the
+#   nodes in preorder. 'u' is an ancestor of 'v' iff pre[u] <= pre[v] and post[v] <= post[u].
+#   * euler - the Euler tour of the tree: the 2n - 1 nodes met by a DFS which writes a node when
+#   entering it and again every time it comes back from one of its children. first[v] is the
+#   position of the first occurrence of 'v' (used for lowest common ancestor queries).
+# The tree is rooted with a single iterative DFS over the undirected edges in CSR form, like the
+# flat queue of root_tree() above: a stack of nodes and a cursor per node into its neighbours
+# replace the recursion, so the cost doesn't depend on the depth of the tree (a path with millions
+# of nodes is as cheap as a star). In a tree, the neighbours of a node other than its parent are
+# its children, so a node found a second time means that the edges contain a cycle. The DFS hands
+# out the preorder and postorder positions as it enters and leaves the nodes, and everything else
+# follows with a few NumPy calls and without another traversal:
+#   size[v] = post[v] - pre[v] + depth[v] + 1, since the nodes before 'v' in postorder are its
+#   descendants plus the nodes before it in preorder other than its ancestors:
+#   post[v] = (size[v] - 1) + (pre[v] - depth[v])
+#   first[v] = 2 * pre[v] - depth[v], and parent[v] appears again in the tour at position
+#   first[v] + 2 * size[v] - 1, right after the tour of the subtree of 'v'
+# Both CSR arrays (the neighbours and the children) are filled by counting, without sorting: the
+# offsets are the running sums of the counts per node, and every entry goes to the offset of its
+# node plus its rank among the entries of that node. So the tree is built in O(n), with a few
+# passes of plain Python over lists and the rest in NumPy.
+
+import numpy as np
+
+
+class RootedTree:
+    # n - number of nodes, src/dst - the columns of the undirected edge list, root - the root node
+    def __init__(self, n, src, dst, root=0):
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        if len(src) != n - 1:
+            raise ValueError('A tree with n nodes must have n - 1 edges')
+        self.n = n
+        self.root = root
+        # undirected adjacency list in CSR form, filled by counting (as in NetworkFlowSolverBase)
+        tails = np.concatenate((src, dst))
+        heads = np.concatenate((dst, src))
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tails, minlength=n), out=offsets[1:])
+        offsets = offsets.tolist()
+        fill = offsets[:-1]
+        adjacency = [0] * len(tails)
+        for tail, head in zip(tails.tolist(), heads.tolist()):
+            adjacency[fill[tail]] = head
+            fill[tail] += 1
+
+        # iterative DFS over plain lists, cursor[v] is the position of the next neighbour of 'v'
+        cursor = offsets[:-1]
+        parent = [-1] * n
+        depth = [0] * n
+        pre = [-1] * n
+        post = [0] * n
+        # rank[v] - position of 'v' among the children of its parent, in the order visited
+        rank = [0] * n
+        child_count = [0] * n
+        pre[root] = 0
+        preorder = [root]
+        stack = [root]
+        done = 0
+        while stack:
+            v = stack[-1]
+            i = cursor[v]
+            if i == offsets[v + 1]:
+                post[v] = done
+                done += 1
+                stack.pop()
+                continue
+            cursor[v] = i + 1
+            child = adjacency[i]
+            if child == parent[v]:
+                continue
+            # a node found twice was reached through a cycle
+            if pre[child] != -1:
+                raise ValueError('Edges do not form a tree')
+            parent[child] = v
+            depth[child] = depth[v] + 1
+            rank[child] = child_count[v]
+            child_count[v] += 1
+            pre[child] = len(preorder)
+            preorder.append(child)
+            stack.append(child)
+        if len(preorder) != n:
+            raise ValueError('Edges do not form a tree')
+        parent = np.array(parent, dtype=np.int32)
+        depth = np.array(depth, dtype=np.int32)
+        pre = np.array(pre, dtype=np.int32)
+        post = np.array(post, dtype=np.int32)
+        preorder = np.array(preorder, dtype=np.int32)
+        size = post - pre + depth + 1
+
+        # children in CSR form, grouped by parent (in the order the DFS visited them)
+        non_root = preorder[1:]
+        child_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(child_count, out=child_offsets[1:])
+        rank = np.array(rank, dtype=np.int64)
+        children = np.empty(n - 1, dtype=np.int32)
+        children[child_offsets[parent[non_root]] + rank[non_root]] = non_root
+
+        self.parent, self.depth, self.size = parent, depth, size
+        self.children, self.child_offsets = children, child_offsets
+        self.pre, self.post, self.preorder = pre, post, preorder
+        self.first = 2 * pre - depth
+        self.euler = np.empty(2 * n - 1, dtype=np.int32)
+        self.euler[self.first] = np.arange(n, dtype=np.int32)
+        self.euler[self.first[non_root] + 2 * size[non_root] - 1] = parent[non_root]
+        self.height = int(depth.max())
+
+    # Builds the tree from (u, v) tuples
+    @classmethod
+    def from_edges(cls, n, edges, root=0):
+        src, dst = zip(*edges) if edges else ((), ())
+        return cls(n, src, dst, root)
+
+    def children_of(self, v):
+        return self.children[self.child_offsets[v]:self.child_offsets[v + 1]]
+
+    def is_ancestor(self, u, v):
+        return self.pre[u] <= self.pre[v] and self.post[v] <= self.post[u]
+
+
+#           0
+#         / | \
+#        1  2  3
+#       / \     \
+#      4   5     6
+rooted = RootedTree.from_edges(7, [(0, 1), (0, 2), (0, 3), (1, 4), (1, 5), (3, 6)])
+print(rooted.parent) # [-1  0  0  0  1  1  3]
+print(rooted.size) # [7 3 1 2 1 1 1]
+print(rooted.preorder) # [0 1 4 5 2 3 6]
+print(rooted.euler) # [0 1 4 1 5 1 0 2 0 3 6 3 0]
+print(rooted.is_ancestor(1, 5), rooted.is_ancestor(2, 6)) # True False
+
+
+# LOWEST COMMON ANCESTOR (LCA)
+
+# The LCA of two nodes 'u' and 'v' of a rooted tree is the deepest node which is an ancestor of
+# both (a node counts as its own ancestor). The distance between 'u' and 'v' in the tree is then
+# depth[u] + depth[v] - 2 * depth[lca(u, v)]. LcaIndex builds one of two indexes on a RootedTree:
+
+# EULER TOUR + SPARSE TABLE: Between the first occurrences of 'u' and 'v' in the Euler tour, the
+# tour walks from 'u' to 'v' through their LCA, and never higher. So the LCA is the node with the
+# smallest depth in euler[first[u]:first[v] + 1], a Range Minimum Query (RMQ). A sparse table
+# stores the answer for every range whose length is a power of two: table[k][i] covers the 2^k
+# positions starting at 'i', and table[k] is computed from two halves in table[k - 1]. Any range
+# is covered by two (overlapping) power of two ranges, so a query is two lookups: O(1) per query
+# after O(n log n) time and memory to build.
+
+# BINARY LIFTING: up[k][v] is the ancestor 2^k levels above 'v' (the root for the nodes less than
+# 2^k deep), and up[k] is up[k - 1] applied twice. The deeper node is first lifted to the depth of
+# the other one, by jumping over the set bits of the depth difference. Then both nodes jump up by
+# the largest powers of two which keep them apart, which leaves them right below their LCA: O(log n)
+# per query, with the same O(n log n) index.
+
+# Both indexes are NumPy arrays, so lca_many() answers a whole batch of queries with a handful of
+# NumPy operations (one per power of two for binary lifting) instead of a Python loop per query.
+
+
+class LcaIndex:
+    # tree - a RootedTree, method - 'sparse_table' or 'binary_lifting'
+    def __init__(self, tree, method='sparse_table'):
+        self.tree = tree
+        self.method = method
+        depth = tree.depth
+        if method == 'sparse_table':
+            m = len(tree.euler)
+            # log[length] = floor(log2(length)), the size of the power of two ranges of a query
+            self.log = np.zeros(m + 1, dtype=np.int32)
+            self.log[2:] = np.floor(np.log2(np.arange(2, m + 1))).astype(np.int32)
+            # one row per power of two, the entries past the end of the tour are never read
+            table = np.empty((int(self.log[m]) + 1, m), dtype=np.int32)
+            table[0] = tree.euler
+            for k in range(1, len(table)):
+                half, size = 1 << (k - 1), m - (1 << k) + 1
+                left, right = table[k - 1, :size], table[k - 1, half:half + size]
+                table[k, :size] = np.where(depth[left] <= depth[right], left, right)
+            self.table = table
+        elif method == 'binary_lifting':
+            parent = np.where(tree.parent == -1, np.arange(tree.n), tree.parent).astype(np.int32)
+            up = [parent]
+            while 1 << len(up) <= max(tree.height, 1):
+                up.append(up[-1][up[-1]])
+            self.up = up
+        else:
+            raise ValueError('Unknown method: ' + str(method))
+
+    def lca(self, u, v):
+        return int(self.lca_many(np.array([u]), np.array([v]))[0])
+
+    def distance(self, u, v):
+        return int(self.distance_many(np.array([u]), np.array([v]))[0])
+
+    # Returns the LCA of every pair (u[i], v[i]) of the arrays 'u' and 'v'
+    def lca_many(self, u, v):
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        if self.method == 'sparse_table':
+            first, depth = self.tree.first, self.tree.depth
+            left = np.minimum(first[u], first[v])
+            right = np.maximum(first[u], first[v])
+            k = self.log[right - left + 1]
+            a = self.table[k, left]
+            b = self.table[k, right - (1 << k) + 1]
+            return np.where(depth[a] <= depth[b], a, b)
+        depth = self.tree.depth
+        # make 'u' the deeper node of every pair, then lift it to the depth of 'v'
+        swap = depth[u] < depth[v]
+        u, v = np.where(swap, v, u), np.where(swap, u, v)
+        diff = depth[u] - depth[v]
+        for k, up in enumerate(self.up):
+            jump = (diff >> k) & 1 == 1
+            u = np.where(jump, up[u], u)
+        for up in reversed(self.up):
+            apart = up[u] != up[v]
+            u = np.where(apart, up[u], u)
+            v = np.where(apart, up[v], v)
+        return np.where(u == v, u, self.up[0][u]).astype(np.int32)
+
+    # Returns the number of edges between every pair (u[i], v[i]) of the arrays 'u' and 'v'
+    def distance_many(self, u, v):
+        depth = self.tree.depth
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        return depth[u] + depth[v] - 2 * depth[self.lca_many(u, v)]
+
+
+for method in ('sparse_table', 'binary_lifting'):
+    lca_index = LcaIndex(rooted, method)
+    print(lca_index.lca(4, 5), lca_index.lca(5, 6), lca_index.distance(4, 6)) # 1 0 4
+    print(lca_index.lca_many([4, 2, 6], [5, 2, 3])) # [1 2 3]
+
+
+# LEAF SUM, HEIGHT, SUBTREE SIZES, DIAMETER AND CENTERS IN ONE PASS
+
+# leafSum() and treeHeight() above are recursive, so they crash on trees deeper than the recursion
+# limit (eg: a degenerate 100k node path), and every aggregate walks the whole tree again.
+# All of these values only depend on the values of the children of a node, so they can be
+# computed together in one loop over the nodes in reverse BFS order (from root_tree()), which
+# visits every child before its parent, like a postorder traversal. Every node adds its values
+# into its parent as soon as it is done, so no children lists are needed either:
+#   * size[v] - number of nodes in the subtree of 'v' (1 + the sizes of its children)
+#   * height[v] - number of edges from 'v' to the lowest leaf below it (1 + the max child height)
+#   * leaf_sum[v] - sum of the values of the leaves below 'v' (its own value for a leaf)
+# DIAMETER: The longest path of the tree (its diameter) goes down from its topmost node 'v' into
+# the two children of 'v' with the largest heights. So the length of the longest path with 'v'
+# as its topmost node is the sum of the two largest (child height + 1) values, and the diameter is
+# the largest of these sums. Every node only keeps the largest two values, and which child gives
+# the largest one ('down'), to walk the path down from the best topmost node afterwards.
+# CENTERS: The center(s) of the tree are the middle node(s) of the diameter path, so they are read
+# from the path instead of peeling the leaves layer by layer as in treeCenters().
+
+
+class TreeMetrics:
+    # g - tree stored as an undirected adjacency list, values - the value of every node (for the
+    # leaf sums, 1 by default which counts the leaves), root - the node to root the tree at
+    def __init__(self, g, values=None, root=0):
+        n = len(g)
+        if n == 0:
+            raise ValueError('Tree must have at least one node')
+        # every edge is stored twice in the adjacency list
+        if sum(len(neighbours) for neighbours in g) != 2 * (n - 1):
+            raise ValueError('A tree with n nodes must have n - 1 edges')
+        # raises if some node is not reached or is reached twice (a forest or a cycle)
+        self.parent, order = root_tree(g, root)
+        parent = self.parent
+        size = array('i', [1]) * n
+        height = array('i', [0]) * n
+        second = array('i', [0]) * n # second largest (child height + 1) of every node
+        down = array('i', [-1]) * n # child with the largest height
+        leaf_sum = array('d', [0]) * n
+        best_length, best_top = 0, root
+
+        for v in reversed(order):
+            if size[v] == 1:
+                leaf_sum[v] = 1 if values is None else values[v]
+            length = height[v] + second[v]
+            if length > best_length:
+                best_length, best_top = length, v
+            p = parent[v]
+            if p == -1:
+                continue
+            size[p] += size[v]
+            leaf_sum[p] += leaf_sum[v]
+            h = height[v] + 1
+            if h > height[p]:
+                second[p] = height[p]
+                height[p] = h
+                down[p] = v
+            elif h > second[p]:
+                second[p] = h
+
+        self.size, self.height, self.leaf_sum = size, height, leaf_sum
+        self.diameter = best_length
+        self.diameter_path = self._diameter_path(g, best_top, down)
+        middle = best_length // 2
+        self.centers = self.diameter_path[middle:middle + 1 + best_length % 2]
+
+    # the longest path through 'top': down the highest child, and down the second highest
+    def _diameter_path(self, g, top, down):
+        height, parent = self.height, self.parent
+        first_branch = down[top]
+        second_branch = -1
+        for child in g[top]:
+            if child != parent[top] and child != first_branch:
+                if second_branch == -1 or height[child] > height[second_branch]:
+                    second_branch = child
+        left, right = [], []
+        for branch, path in ((first_branch, left), (second_branch, right)):
+            while branch != -1:
+                path.append(branch)
+                branch = down[branch]
+        return left[::-1] + [top] + right
+
+
+# The tree from the RootedTree example above
+metrics = TreeMetrics([[1, 2, 3], [0, 4, 5], [0], [0, 6], [1], [1], [3]])
+print(metrics.height[0], metrics.leaf_sum[0], list(metrics.size)) # 2 4.0 [7, 3, 1, 2, 1, 1, 1]
+print(metrics.diameter, metrics.diameter_path, metrics.centers) # 4 [6, 3, 0, 1, 5] [0]
+# A triangle plus a separate node has n - 1 edges but isn't a tree, a forest of two edges hasn't
+for g in ([[1, 2], [0, 2], [0, 1], []], [[1], [0], [3], [2]]):
+    try:
+        TreeMetrics(g)
+    except ValueError as error:
+        print(error) # Graph is not a tree / A tree with n nodes must have n - 1 edges
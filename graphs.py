@@ -96,4 +96,255 @@ my_graph.add_edge('C', 'A')
 my_graph.remove_edge('A', 'D') # edge case handled by the try-except block. Notice that 'D' does not have
 # any edge in the Graph.
 
-my_graph.print_graph()
\ No newline at end of file
+my_graph.print_graph()
+
+
+# HASHED ADJACENCY LIST
+
+# Removing an Edge from the adjacency list above costs O(E) because list.remove() has to scan the
+# neighbour list, and removing a Vertex calls list.remove() once for every neighbour, so a vertex
+# with 'deg' neighbours costs O(deg^2) to remove in the worst case.
+# If the neighbours of each Vertex are stored in a dictionary (a hash table - see hash-tables.py)
+# instead of a list, looking up, adding and removing a single Edge are all amortised O(1), and the
+# dictionary value can hold the weight of the Edge for free:
+
+# Adding an Edge: O(1), Removing an Edge: O(1), Checking for an Edge: O(1)
+# Removing a Vertex: O(deg) - one O(1) removal from each neighbour of the Vertex
+
+# The trade-off is memory: a dictionary entry is larger than a list slot, and the neighbours are
+# no longer kept in insertion order once edges are removed and re-added.
+
+
+class HashedGraph:
+    def __init__(self):
+        self.adj_list = {}
+
+    def add_vertex(self, vertex):
+        if vertex not in self.adj_list:
+            self.adj_list[vertex] = {}
+            return True
+        return False
+
+    def has_edge(self, v1, v2):
+        return v1 in self.adj_list and v2 in self.adj_list[v1]
+
+    def weight(self, v1, v2):
+        return self.adj_list[v1][v2]
+
+    def add_edge(self, v1, v2, weight=1):
+        if (v1 in self.adj_list) and (v2 in self.adj_list):
+            self.adj_list[v1][v2] = weight
+            self.adj_list[v2][v1] = weight
+            return True
+        return False
+
+    def remove_edge(self, v1, v2):
+        # Unlike Graph.remove_edge(), a missing edge is reported by returning False
+        if self.has_edge(v1, v2):
+            del self.adj_list[v1][v2]
+            del self.adj_list[v2][v1]
+            return True
+        return False
+
+    def remove_vertex(self, vertex):
+        if vertex in self.adj_list:
+            # remove the vertex itself first so that a self-loop edge is not deleted twice
+            for other_vertex in self.adj_list.pop(vertex):
+                if other_vertex != vertex:
+                    del self.adj_list[other_vertex][vertex]
+            return True
+        return False
+
+    # Adds every edge from an iterable of (v1, v2) or (v1, v2, weight) tuples, creating any
+    # missing vertices along the way. Returns the number of edges added.
+    def add_edges(self, edges):
+        adj_list = self.adj_list
+        count = 0
+        for edge in edges:
+            v1, v2 = edge[0], edge[1]
+            weight = edge[2] if len(edge) > 2 else 1
+            adj_list.setdefault(v1, {})[v2] = weight
+            adj_list.setdefault(v2, {})[v1] = weight
+            count += 1
+        return count
+
+    # Removes every edge from an iterable of (v1, v2) or (v1, v2, weight) tuples, the weight is
+    # ignored. Edges that are not present in the graph are skipped. Returns the number of edges
+    # removed.
+    def remove_edges(self, edges):
+        count = 0
+        for edge in edges:
+            if self.remove_edge(edge[0], edge[1]):
+                count += 1
+        return count
+
+    def print_graph(self):
+        for vertex in self.adj_list:
+            print(vertex, ':', self.adj_list[vertex])
+
+
+my_hashed_graph = HashedGraph()
+my_hashed_graph.add_edges([('A', 'B', 4), ('B', 'C', 2), ('C', 'A', 7), ('C', 'D', 1)])
+print(my_hashed_graph.has_edge('A', 'D')) # False
+print(my_hashed_graph.remove_edge('A', 'D')) # False
+my_hashed_graph.remove_vertex('C')
+my_hashed_graph.print_graph()
+# A : {'B': 4}
+# B : {'A': 4}
+# D : {}
+# the same weighted tuples that add_edges() takes can be passed back to remove_edges()
+weighted_edges = [('A', 'B', 4), ('C', 'D', 1)]
+removal_graph = HashedGraph()
+removal_graph.add_edges(weighted_edges)
+print(removal_graph.remove_edges(weighted_edges + [('A', 'D', 2)])) # 2
+
+
+
+# COMPRESSED SPARSE ROW (CSR) REPRESENTATION
+
+# The adjacency list above stores every edge as a separate Python object inside a Python list,
+# so a large graph pays for a pointer plus an object header per edge and the neighbours of a
+# vertex are scattered around memory. Once a graph stops changing, it can be "frozen" into a
+# Compressed Sparse Row (CSR) form which packs all the adjacency lists back to back into flat
+# typed arrays:
+#   * offsets - array of size V + 1. The neighbours of the vertex with index i are stored
+#   at positions offsets[i] up to (but excluding) offsets[i + 1] of the 'neighbours' array.
+#   * neighbours - array of size E (2E for bidirectional edges) holding vertex indices.
+#   * weights - array of size E, parallel to 'neighbours', holding the weight of each edge.
+# Vertices are relabelled with integer indices in the range [0, V) and 'labels' maps an index
+# back to the original vertex.
+"""
+ADJACENCY LIST                 CSR
+
+A : ['B', 'C']                 labels     = ['A', 'B', 'C']
+B : ['A', 'C']                 offsets    = [0, 2, 4, 6]
+C : ['B', 'A']                 neighbours = [1, 2, 0, 2, 1, 0]
+                               weights    = [1, 1, 1, 1, 1, 1]
+"""
+# Space Complexity: O(V + E) but with 4 or 8 bytes per entry instead of a full Python object.
+# A CSR graph cannot have vertices or edges added or removed. Rebuild it from the Graph instead.
+
+from array import array
+from collections import deque
+import heapq
+
+
+class CSRGraph:
+    def __init__(self, labels, offsets, neighbours, weights):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.offsets = offsets
+        self.neighbours = neighbours
+        self.weights = weights
+
+    # Builds the CSR form of a Graph or HashedGraph in one pass over its adjacency list. Edges
+    # of a Graph are unweighted, so they get a weight of 1 unless 'weight' says otherwise. The
+    # edges of a HashedGraph keep their own weights.
+    @classmethod
+    def from_graph(cls, graph, weight=1):
+        labels = list(graph.adj_list.keys())
+        index = {label: i for i, label in enumerate(labels)}
+        offsets = array('q', [0])
+        neighbours = array('i')
+        weights = array('d')
+        for label in labels:
+            adjacent = graph.adj_list[label]
+            neighbours.extend([index[other] for other in adjacent])
+            if isinstance(adjacent, dict):
+                weights.extend(adjacent.values())
+            else:
+                weights.extend([weight] * len(adjacent))
+            offsets.append(len(neighbours))
+        return cls(labels, offsets, neighbours, weights)
+
+    def num_vertices(self):
+        return len(self.labels)
+
+    def num_edges(self):
+        return len(self.neighbours)
+
+    def neighbours_of(self, vertex):
+        i = self.index[vertex]
+        return [self.labels[j] for j in self.neighbours[self.offsets[i]:self.offsets[i + 1]]]
+
+    # Breadth First Search from 'start'. Returns the vertices in the order they were visited.
+    def bfs(self, start):
+        offsets, neighbours = self.offsets, self.neighbours
+        s = self.index[start]
+        visited = bytearray(len(self.labels))
+        visited[s] = 1
+        order = [s]
+        q = deque([s])
+        while q:
+            at = q.popleft()
+            for j in range(offsets[at], offsets[at + 1]):
+                to = neighbours[j]
+                if not visited[to]:
+                    visited[to] = 1
+                    order.append(to)
+                    q.append(to)
+        return [self.labels[i] for i in order]
+
+    # Iterative Depth First Search from 'start' using an explicit stack, so that deep graphs
+    # don't hit Python's recursion limit. Returns the vertices in the order they were visited.
+    def dfs(self, start):
+        offsets, neighbours = self.offsets, self.neighbours
+        visited = bytearray(len(self.labels))
+        order = []
+        stack = [self.index[start]]
+        while stack:
+            at = stack.pop()
+            if visited[at]:
+                continue
+            visited[at] = 1
+            order.append(at)
+            # push the neighbours in reverse so that they are visited in adjacency list order,
+            # just like the recursive DFS would
+            for j in range(offsets[at + 1] - 1, offsets[at] - 1, -1):
+                if not visited[neighbours[j]]:
+                    stack.append(neighbours[j])
+        return [self.labels[i] for i in order]
+
+    # Shortest path from 'start' to 'end' using Dijkstra's algorithm over the edge weights.
+    # Returns a (distance, path) tuple, or (inf, []) if 'end' cannot be reached.
+    def shortest_path(self, start, end):
+        offsets, neighbours, weights = self.offsets, self.neighbours, self.weights
+        n = len(self.labels)
+        s, e = self.index[start], self.index[end]
+        dist = array('d', [float('inf')]) * n
+        prev = array('i', [-1]) * n
+        dist[s] = 0.0
+        pq = [(0.0, s)]
+        while pq:
+            d, at = heapq.heappop(pq)
+            if d > dist[at]:
+                continue # stale entry
+            if at == e:
+                break
+            for j in range(offsets[at], offsets[at + 1]):
+                to = neighbours[j]
+                new_dist = d + weights[j]
+                if new_dist < dist[to]:
+                    dist[to] = new_dist
+                    prev[to] = at
+                    heapq.heappush(pq, (new_dist, to))
+        if dist[e] == float('inf'):
+            return float('inf'), []
+        path = []
+        at = e
+        while at != -1:
+            path.append(self.labels[at])
+            at = prev[at]
+        path.reverse()
+        return dist[e], path
+
+
+my_graph.add_edge('C', 'D')
+csr_graph = CSRGraph.from_graph(my_graph)
+print(csr_graph.offsets.tolist(), csr_graph.neighbours.tolist()) # [0, 2, 4, 7, 8] [1, 2, 0, 2, 1, 0, 3, 2]
+print(csr_graph.bfs('A')) # ['A', 'B', 'C', 'D']
+print(csr_graph.dfs('A')) # ['A', 'B', 'C', 'D']
+print(csr_graph.shortest_path('A', 'D')) # (2.0, ['A', 'C', 'D'])
+
+csr_hashed_graph = CSRGraph.from_graph(my_hashed_graph)
+print(csr_hashed_graph.shortest_path('B', 'A')) # (4.0, ['B', 'A'])
@@ -0,0 +1,389 @@
+# Segment Trees and Fenwick Trees (Binary Indexed Trees) answer range queries over an array, like
+# "what is the sum/min/max of values[l:r]?", in O(logN) instead of rescanning the range in O(N), while
+# still allowing the values to change. Both are stored in a flat array like a Heap (see heap.py), so
+# there are no Node objects and no pointers to follow.
+
+# Range Queries in the Wild:
+#   * Rolling metrics (the sum/min/max of the last k samples of a time series)
+#   * Order statistics and counting inversions
+#   * Interval scheduling / booking systems (range assign + range max)
+#   * Computational geometry (sweep lines over rectangles)
+
+
+# SEGMENT TREE:
+
+# A Segment Tree is a Complete Binary Tree where every leaf holds one value of the array and every
+# parent holds the combination (sum/min/max...) of its two children, ie, of the whole segment of the
+# array below it. The leaves are padded up to the next power of two 'size', and the tree is stored
+# 1-based like the Heap: the root is at index 1, the children of 'k' are at 2k and 2k + 1, and the
+# leaf of values[i] is at size + i.
+"""
+values = [5, 8, 6, 3]                         [22]                   index 1
+                                            /      \
+                                        [13]        [9]              index 2, 3
+                                        /  \       /  \
+                                      [5]  [8]   [6]  [3]            index 4, 5, 6, 7 (size + i)
+"""
+# QUERY(l, r): The half-open range [l, r) is covered by at most 2logN segments. Walking up from the
+# leaves l and r - 1 at the same time, a left boundary which is a right child (odd index) is taken on
+# its own and stepped over, and so is a right boundary which is a left child. Everything between the
+# boundaries is covered by their parents, so the walk continues one level up. No recursion is needed.
+# The left and right parts are combined separately, so the combine function ('op') does not need to
+# be commutative, only associative with an identity value (a Monoid): sum/0, min/inf, max/-inf,
+# gcd/0, matrix product/identity matrix...
+# POINT UPDATE(i): Set the leaf and recompute its logN ancestors.
+
+# LAZY PROPAGATION: Adding a value to (or assigning a value to) every value of a range one by one
+# would be O(N logN). Instead, the update is applied to the same 2logN segments which cover the range
+# (the value of a segment of length L changes by delta * L for a sum, and by delta for a min/max) and
+# is remembered on them as a pending tag. The tag is pushed down to the two children only when a
+# later query or update needs to look below that segment. Pushing all the tags on the paths from the
+# root to the two boundary leaves before every operation keeps every visited value up to date, so both
+# range updates and range queries are O(logN).
+# A pending tag is either "assign x" or "add d". An add on top of an assign is folded into the
+# assigned value, and an assign replaces everything below it, so one (assign, add) pair per node is
+# enough. Lazy updates need to know how a tag changes a segment, so they are only supported for the
+# built-in 'sum', 'min' and 'max' ops.
+
+# Build: O(N)
+# Query, Point Update, Range Update: O(logN)
+# Space: O(N)
+
+import numpy as np
+from math import gcd
+
+
+# op: (python combine, numpy combine for the bulk build, identity)
+_SEGMENT_TREE_OPS = {
+    'sum': (lambda a, b: a + b, np.add, 0),
+    'min': (lambda a, b: a if a <= b else b, np.minimum, float('inf')),
+    'max': (lambda a, b: a if a >= b else b, np.maximum, float('-inf')),
+}
+
+
+class SegmentTree:
+    # values - the initial array, op - 'sum', 'min', 'max' or a custom associative function of two
+    # values, identity - the value with op(identity, x) == x (required for a custom op)
+    def __init__(self, values, op='sum', identity=None):
+        n = len(values)
+        if n == 0:
+            raise ValueError('SegmentTree needs at least one value')
+        if callable(op):
+            if identity is None:
+                raise ValueError('A custom op needs an identity value')
+            self.op, self.identity, self.lazy = op, identity, False
+        elif op in _SEGMENT_TREE_OPS:
+            self.op, np_op, default = _SEGMENT_TREE_OPS[op]
+            self.identity = default if identity is None else identity
+            self.lazy = True
+        else:
+            raise ValueError('Unknown op: ' + str(op))
+        self.n = n
+        self.log = (n - 1).bit_length()
+        self.size = size = 1 << self.log
+        self.scaled = op == 'sum' # a sum segment changes by (delta * its length)
+
+        if self.lazy:
+            # Build every level at once from the level below it with numpy. The padding leaves are
+            # never inside a query range (they are past 'n'), so they just repeat a real value to keep
+            # the dtype of the values (an int array stays int instead of turning into floats).
+            leaves = np.asarray(values)
+            if leaves.ndim != 1 or leaves.dtype.kind not in 'biuf':
+                raise ValueError('Values of a sum/min/max SegmentTree must be numbers')
+            tree = np.empty(2 * size, dtype=leaves.dtype)
+            tree[size:size + n] = leaves
+            tree[size + n:] = 0 if self.scaled else leaves[-1]
+            level = size
+            while level > 1:
+                tree[level // 2:level] = np_op(tree[level:2 * level:2], tree[level + 1:2 * level:2])
+                level //= 2
+            # python lists are much faster than numpy arrays to read and write one value at a time
+            self.tree = tree.tolist()
+            self.assign_tag = [None] * size
+            self.add_tag = [0] * size
+        else:
+            self.tree = [self.identity] * (2 * size)
+            self.tree[size:size + n] = values
+            for k in range(size - 1, 0, -1):
+                self.tree[k] = op(self.tree[2 * k], self.tree[2 * k + 1])
+
+    def __len__(self):
+        return self.n
+
+    def _check_range(self, l, r):
+        if not 0 <= l <= r <= self.n:
+            raise IndexError('Range [%d, %d) out of bounds for %d values' % (l, r, self.n))
+
+    # recompute a parent from its two children
+    def _update(self, k):
+        self.tree[k] = self.op(self.tree[2 * k], self.tree[2 * k + 1])
+
+    # apply the tag (assign, add) to the whole segment 'k' and remember it if 'k' has children
+    def _apply(self, k, assign, add):
+        length = self.size >> (k.bit_length() - 1) if self.scaled else 1
+        if assign is not None:
+            self.tree[k] = assign * length
+            if k < self.size:
+                self.assign_tag[k] = assign
+                self.add_tag[k] = 0
+        else:
+            self.tree[k] += add * length
+            if k < self.size:
+                if self.assign_tag[k] is not None:
+                    self.assign_tag[k] += add
+                else:
+                    self.add_tag[k] += add
+
+    # hand the pending tag of 'k' down to its two children
+    def _push(self, k):
+        assign, add = self.assign_tag[k], self.add_tag[k]
+        if assign is not None or add:
+            self._apply(2 * k, assign, add)
+            self._apply(2 * k + 1, assign, add)
+            self.assign_tag[k] = None
+            self.add_tag[k] = 0
+
+    # push the tags on the paths from the root down to the leaves l and r - 1
+    def _push_boundaries(self, l, r):
+        for i in range(self.log, 0, -1):
+            if ((l >> i) << i) != l:
+                self._push(l >> i)
+            if ((r >> i) << i) != r:
+                self._push((r - 1) >> i)
+
+    # Returns op over values[l:r] (the identity for an empty range)
+    def query(self, l, r):
+        self._check_range(l, r)
+        l += self.size
+        r += self.size
+        if self.lazy:
+            self._push_boundaries(l, r)
+        op, tree = self.op, self.tree
+        left = right = self.identity
+        while l < r:
+            if l & 1:
+                left = op(left, tree[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                right = op(tree[r], right)
+            l >>= 1
+            r >>= 1
+        return op(left, right)
+
+    def get(self, i):
+        self._check_range(i, i + 1)
+        k = i + self.size
+        if self.lazy:
+            for j in range(self.log, 0, -1):
+                self._push(k >> j)
+        return self.tree[k]
+
+    # Sets values[i] = value
+    def set(self, i, value):
+        self._check_range(i, i + 1)
+        k = i + self.size
+        if self.lazy:
+            for j in range(self.log, 0, -1):
+                self._push(k >> j)
+        self.tree[k] = value
+        for j in range(1, self.log + 1):
+            self._update(k >> j)
+
+    # Adds 'delta' to every value of values[l:r]
+    def range_add(self, l, r, delta):
+        self._range_update(l, r, None, delta)
+
+    # Sets every value of values[l:r] to 'value'
+    def range_assign(self, l, r, value):
+        self._range_update(l, r, value, 0)
+
+    def _range_update(self, l, r, assign, add):
+        if not self.lazy:
+            raise ValueError('Range updates are only supported for the sum, min and max ops')
+        self._check_range(l, r)
+        if l == r:
+            return
+        l += self.size
+        r += self.size
+        self._push_boundaries(l, r)
+        # apply the tag to the segments covering [l, r), exactly like a query visits them
+        left, right = l, r
+        while left < right:
+            if left & 1:
+                self._apply(left, assign, add)
+                left += 1
+            if right & 1:
+                right -= 1
+                self._apply(right, assign, add)
+            left >>= 1
+            right >>= 1
+        # then recompute the ancestors of the segments, bottom up
+        for i in range(1, self.log + 1):
+            if ((l >> i) << i) != l:
+                self._update(l >> i)
+            if ((r >> i) << i) != r:
+                self._update((r - 1) >> i)
+
+
+readings = [5, 8, 6, 3, 2, 7, 2, 6]
+sums = SegmentTree(readings)
+mins = SegmentTree(readings, 'min')
+print(sums.query(0, 8), sums.query(2, 5), mins.query(2, 5)) # 39 11 2
+sums.range_add(1, 6, 10)
+mins.range_add(1, 6, 10)
+print(sums.query(0, 8), sums.query(2, 5), mins.query(0, 8)) # 89 41 2
+sums.range_assign(0, 4, 1)
+sums.set(7, 0)
+print(sums.query(0, 8), sums.get(3), sums.get(5)) # 35 1 17
+
+# A custom Monoid: gcd of a range (gcd(0, x) == x, so 0 is the identity)
+gcds = SegmentTree([12, 18, 24, 9, 27], gcd, identity=0)
+print(gcds.query(0, 3), gcds.query(0, 5), gcds.query(3, 5)) # 6 3 9
+
+# max_subarray() from general-lc-problems.py, but for any range [l, r) and with updates: every
+# segment keeps (total, best prefix, best suffix, best subarray), and two segments combine into:
+#   * best prefix - the best prefix of the left one, or all of the left one + the best prefix of
+#     the right one (and the same for the best suffix)
+#   * best subarray - the best of either one, or a subarray crossing the middle (best suffix of the
+#     left one + best prefix of the right one)
+def combine_subarrays(a, b):
+    return (a[0] + b[0], max(a[1], a[0] + b[1]), max(b[2], b[0] + a[2]), max(a[3], b[3], a[2] + b[1]))
+
+nums = [-2, 1, -3, 4, -1, 2, 1, -5, 4]
+no_subarray = (0, float('-inf'), float('-inf'), float('-inf'))
+subarrays = SegmentTree([(x, x, x, x) for x in nums], combine_subarrays, no_subarray)
+print(subarrays.query(0, 9)[3], subarrays.query(0, 3)[3]) # 6 1
+subarrays.set(7, (5, 5, 5, 5))
+print(subarrays.query(0, 9)[3]) # 15
+
+
+
+
+# FENWICK TREE (BINARY INDEXED TREE):
+
+# When the only query is a sum (or any invertible op: sums of a range are differences of two prefix
+# sums) and the only update is adding to a single value, a Fenwick Tree does the same job in N + 1
+# values instead of 2N, with simpler and faster loops.
+# The Fenwick Tree is 1-based, and the value at index 'i' is responsible for the values of the range
+# (i - lsb(i), i], where lsb(i) = i & -i is the value of the lowest set bit of 'i'. For example,
+# 12 = 0b1100 is responsible for (8, 12], and 7 = 0b111 only for (6, 7].
+#   * PREFIX SUM(i) (sum of values[0:i]): add tree[i], then remove its lowest set bit (i &= i - 1) and
+#     continue: the ranges (i - lsb(i), i] chain down to 0 in at most logN steps.
+#   * ADD(i, delta): every index responsible for values[i] has to change, they are reached by adding
+#     the lowest set bit (j += j & -j), starting at j = i + 1: also at most logN steps.
+# BULK CONSTRUCTION: Adding the N values one by one is O(N logN), but every tree[i] is just the
+# difference of two prefix sums: tree[i] = prefix[i] - prefix[i - lsb(i)]. So the whole tree is one
+# numpy cumsum and one vectorized subtraction: O(N).
+# BATCHES: Many prefix sums at once all take at most logN steps, so instead of a python loop per query,
+# all of them remove their lowest set bit together, in logN vectorized steps. Batches of adds walk
+# up together in the same way (np.add.at adds duplicate indices correctly).
+
+# Build: O(N)
+# Prefix Sum, Range Sum, Add: O(logN)
+# Space: O(N)
+
+
+class FenwickTree:
+    # values - the initial array of numbers
+    def __init__(self, values):
+        values = np.asarray(values)
+        if values.ndim != 1 or values.dtype.kind not in 'biuf':
+            raise ValueError('Values of a FenwickTree must be a 1D array of numbers')
+        self.n = n = len(values)
+        dtype = np.float64 if values.dtype.kind == 'f' else np.int64
+        prefix = np.zeros(n + 1, dtype=dtype)
+        np.cumsum(values, out=prefix[1:])
+        index = np.arange(n + 1)
+        self.tree = prefix - prefix[index - (index & -index)] # tree[0] = 0 is never read
+
+    def __len__(self):
+        return self.n
+
+    # The integer tree array would silently truncate fractional deltas, so they are rejected
+    def _check_deltas(self, deltas):
+        deltas = np.asarray(deltas)
+        if self.tree.dtype.kind != 'i' or deltas.dtype.kind in 'biu':
+            return
+        if not (np.all(np.isfinite(deltas)) and np.array_equal(deltas, np.trunc(deltas))):
+            raise TypeError('Deltas of a FenwickTree of integers must be integers')
+
+    # Adds 'delta' to values[i]
+    def add(self, i, delta):
+        if not 0 <= i < self.n:
+            raise IndexError('Index %d out of bounds for %d values' % (i, self.n))
+        self._check_deltas(delta)
+        tree, n = self.tree, self.n
+        i += 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    # Returns the sum of values[0:i]
+    def prefix_sum(self, i):
+        if not 0 <= i <= self.n:
+            raise IndexError('Index %d out of bounds for %d values' % (i, self.n))
+        tree, total = self.tree, 0
+        while i > 0:
+            total += tree[i]
+            i &= i - 1
+        return total.item() if hasattr(total, 'item') else total
+
+    # Returns the sum of values[l:r]
+    def range_sum(self, l, r):
+        if not 0 <= l <= r <= self.n:
+            raise IndexError('Range [%d, %d) out of bounds for %d values' % (l, r, self.n))
+        return self.prefix_sum(r) - self.prefix_sum(l)
+
+    # Returns the sums of values[0:ends[j]] for every j
+    def prefix_sum_many(self, ends):
+        i = np.array(ends, dtype=np.int64)
+        if i.size and (i.min() < 0 or i.max() > self.n):
+            raise IndexError('Index out of bounds for %d values' % self.n)
+        total = np.zeros(i.shape, dtype=self.tree.dtype)
+        while i.any():
+            total += self.tree[i] # tree[0] = 0, so the finished queries add nothing
+            i &= i - 1
+        return total
+
+    # Returns the sums of values[l[j]:r[j]] for every j
+    def range_sum_many(self, l, r):
+        l = np.asarray(l, dtype=np.int64)
+        r = np.asarray(r, dtype=np.int64)
+        if np.any(l > r):
+            raise IndexError('Range start after range end')
+        return self.prefix_sum_many(r) - self.prefix_sum_many(l)
+
+    # Adds deltas[j] to values[indices[j]] for every j
+    def add_many(self, indices, deltas):
+        i = np.asarray(indices, dtype=np.int64) + 1
+        self._check_deltas(deltas)
+        deltas = np.broadcast_to(np.asarray(deltas, dtype=self.tree.dtype), i.shape)
+        if i.size and (i.min() < 1 or i.max() > self.n):
+            raise IndexError('Index out of bounds for %d values' % self.n)
+        while i.size:
+            np.add.at(self.tree, i, deltas)
+            i += i & -i
+            inside = i <= self.n
+            i, deltas = i[inside], deltas[inside]
+
+
+fenwick = FenwickTree(readings)
+print(fenwick.prefix_sum(8), fenwick.range_sum(2, 5)) # 39 11
+fenwick.add(3, 10)
+print(fenwick.range_sum(2, 5), fenwick.range_sum_many([0, 2, 4], [8, 5, 4])) # 21 [49 21  0]
+
+# A rolling window of the last 8 samples: every new sample replaces the oldest one
+fenwick = FenwickTree(readings)
+samples = [4, 9, 1, 6]
+for t, sample in enumerate(samples):
+    slot = (len(readings) + t) % len(readings)
+    fenwick.add(slot, sample - readings[slot])
+    readings[slot] = sample
+print(fenwick.prefix_sum(8), readings) # 37 [4, 9, 1, 6, 2, 7, 2, 6]
+# The tree of integer readings only takes integer deltas (2.0 is fine, 0.5 would be truncated)
+fenwick.add(0, 2.0)
+try:
+    fenwick.add_many([1, 2], [1, 0.5])
+except TypeError as error:
+    print(fenwick.prefix_sum(8), error) # 39 Deltas of a FenwickTree of integers must be integers